@@ -1,11 +1,23 @@
 """Password hashing (bcrypt) and JWT handling. Do not use passlib."""
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
 import jwt
 
-from app.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+from app.cache import TTLCache
+from app.config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_HASH_WORKERS,
+    SECRET_KEY,
+    TOKEN_CACHE_SIZE,
+)
 
 
 def hash_password(password: str) -> str:
@@ -22,6 +34,97 @@ def verify_password(plain: str, hashed: str) -> bool:
     )
 
 
+class PasswordHasherBusy(Exception):
+    """All hashing workers are busy and the queue is full (answered with 503)."""
+
+
+class PasswordHasher:
+    """Bounded executor for bcrypt so a hash (~200 ms) never blocks the event loop.
+
+    bcrypt releases the GIL, so threads give real parallelism. At most max_workers
+    hashes run at once and max_queue wait; anything beyond raises PasswordHasherBusy.
+    A job stays counted until its thread is done with it: cancelling the caller (client
+    disconnect) drops a queued job (counted as cancelled) but cannot stop a running one.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        # Counters are touched from event loop threads and worker threads
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+        submitted = time.perf_counter()
+
+        def job():
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self._running += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def finished(future):
+            # Runs in the worker thread once the job ran, or wherever it was cancelled
+            # before starting; registered before wrap_future so run() returns after it
+            with self._lock:
+                self._pending -= 1
+                if future.cancelled():
+                    self._cancelled += 1
+                else:
+                    self._completed += 1
+
+        future = self._executor.submit(job)
+        future.add_done_callback(finished)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "cancelled": self._cancelled,
+                "rejected": self._rejected,
+                "wait_seconds_avg": self._wait_total / self._completed if self._completed else 0.0,
+                "wait_seconds_max": self._wait_max,
+            }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the password_hasher pool. Raises PasswordHasherBusy when saturated."""
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password on the password_hasher pool. Raises PasswordHasherBusy when saturated."""
+    return await password_hasher.run(verify_password, plain, hashed)
+
+
 def create_access_token(sub: str, email: str) -> str:
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -39,3 +142,18 @@ def decode_access_token(token: str) -> dict | None:
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.PyJWTError:
         return None
+
+
+# Tokens whose signature was already verified, kept until their exp
+token_cache = TTLCache(TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def decode_access_token_cached(token: str) -> dict | None:
+    """decode_access_token, skipping signature verification for tokens seen before."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_access_token(token)
+    if payload and "exp" in payload:
+        token_cache.set(token, payload, ttl=payload["exp"] - time.time())
+    return payload
@@ -0,0 +1,149 @@
+"""Small in-process caches (per worker)."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Bounded LRU map whose entries also expire after a TTL.
+
+    Thread-safe (TestClient and executors call in from other threads). ttl <= 0 or
+    maxsize <= 0 disables the cache: every get is a miss and set is a no-op.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value; ttl overrides (and is capped by) the cache TTL."""
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Result of a load that failed or was cancelled: waiters run the loader themselves
+_FAILED = object()
+
+
+class LoadingCache:
+    """TTLCache in front of an async loader, with request coalescing: concurrent misses
+    for one key run the loader once and share its result. None is never cached.
+
+    invalidate() and clear() also discard loads already in flight, so a value read
+    before a write cannot be stored after it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize, ttl)
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        return self.cache.get(key)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.cache.enabled:
+            return await loader()
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self.coalesced += 1
+            value = await asyncio.shield(pending)
+            if value is not _FAILED:
+                return value
+        generation = self._generation
+        future = loop.create_future()
+        self._inflight[key] = future
+        self.loads += 1
+        try:
+            value = await loader()
+        except BaseException:
+            future.set_result(_FAILED)
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+        if value is not None and generation == self._generation:
+            self.cache.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self.cache.pop(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+        }
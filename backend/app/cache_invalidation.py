@@ -0,0 +1,119 @@
+"""Cross-worker invalidation for the in-process read caches.
+
+Each worker invalidates its own caches as soon as it writes. Other workers learn about
+the write from a backend (CACHE_INVALIDATION_BACKEND):
+
+- postgres: a trigger on the table NOTIFYs on commit (migration 7 for projects), and
+  each worker LISTENs on one connection. Writes from any source (other workers, psql,
+  seed commands) are seen; after a reconnect every cache is cleared, since notifications
+  sent meanwhile are lost.
+- none: nothing is received; other workers serve stale entries until their TTL.
+
+Messages are JSON {"cache": <name>, "key": <key or null>}; caches register a handler
+under their name with register().
+"""
+
+import json
+import logging
+from collections.abc import Callable
+
+from app.config import CACHE_INVALIDATION_BACKEND
+from app.events import PgListener
+
+logger = logging.getLogger(__name__)
+
+# Also written into the projects triggers (migration 7): renaming it takes a migration
+CHANNEL = "toolme_cache"
+
+
+class InvalidationBackend:
+    """Delivers invalidations made by other processes. The base class receives none."""
+
+    name = "none"
+
+    async def start(self, on_message: Callable[[dict], None], on_reset: Callable[[], None]) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresInvalidationBackend(InvalidationBackend):
+    name = "postgres"
+
+    def __init__(self, dsn: str | None = None, channel: str = CHANNEL):
+        self._dsn = dsn
+        self._channel = channel
+        self._listener: PgListener | None = None
+
+    async def start(self, on_message: Callable[[dict], None], on_reset: Callable[[], None]) -> None:
+        def on_notify(payload: str) -> None:
+            try:
+                message = json.loads(payload)
+            except ValueError:
+                logger.warning("Ignoring malformed cache invalidation payload")
+                return
+            on_message(message)
+
+        self._listener = PgListener(self._channel, on_notify, dsn=self._dsn, on_connect=on_reset)
+        await self._listener.start()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            await self._listener.stop()
+            self._listener = None
+
+
+BACKENDS: dict[str, type[InvalidationBackend]] = {
+    "postgres": PostgresInvalidationBackend,
+    "none": InvalidationBackend,
+}
+
+
+class CacheInvalidator:
+    """Registry of cache handlers, fed by the configured backend."""
+
+    def __init__(self, backend: InvalidationBackend):
+        self.backend = backend
+        self._handlers: dict[str, tuple[Callable[[object], None], Callable[[], None]]] = {}
+        self.received = 0
+        self.resets = 0
+
+    def register(
+        self, cache: str, invalidate: Callable[[object], None], clear: Callable[[], None]
+    ) -> None:
+        """invalidate(key) drops one entry (key None: whatever depends on the whole set);
+        clear() empties the cache.
+        """
+        self._handlers[cache] = (invalidate, clear)
+
+    def dispatch(self, message: dict) -> None:
+        handlers = self._handlers.get(message.get("cache"))
+        if handlers is None:
+            return
+        self.received += 1
+        handlers[0](message.get("key"))
+
+    def reset(self) -> None:
+        self.resets += 1
+        for _invalidate, clear in self._handlers.values():
+            clear()
+
+    async def start(self) -> None:
+        await self.backend.start(self.dispatch, self.reset)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "received": self.received,
+            "resets": self.resets,
+        }
+
+
+if CACHE_INVALIDATION_BACKEND not in BACKENDS:
+    raise SystemExit(f"CACHE_INVALIDATION_BACKEND must be one of: {', '.join(BACKENDS)}")
+
+invalidator = CacheInvalidator(BACKENDS[CACHE_INVALIDATION_BACKEND]())
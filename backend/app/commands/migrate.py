@@ -0,0 +1,41 @@
+"""Apply pending schema migrations (app/migrations.py).
+
+Safe to run from several processes at once (advisory lock); run it as a deploy step when
+MIGRATE_ON_STARTUP=false:
+    uv run python -m app.commands.migrate [--status]
+"""
+
+import argparse
+import asyncio
+
+from app.database import engine
+from app.migrations import LATEST_VERSION, MIGRATIONS, current_version, migrate
+
+
+async def run(status_only: bool = False) -> None:
+    try:
+        if status_only:
+            async with engine.connect() as conn:
+                version = await current_version(conn)
+            print(f"schema version {version} (latest {LATEST_VERSION})")
+            for m in MIGRATIONS:
+                if m.version > version:
+                    print(f"pending {m.version:04d} {m.name}")
+            return
+        applied = await migrate(engine)
+        for m in applied:
+            print(f"applied {m.version:04d} {m.name}")
+        print(f"{len(applied)} migration(s) applied, schema at version {LATEST_VERSION}")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--status", action="store_true", help="show version, apply nothing")
+    args = parser.parse_args()
+    asyncio.run(run(args.status))
+
+
+if __name__ == "__main__":
+    main()
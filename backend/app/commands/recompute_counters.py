@@ -0,0 +1,33 @@
+"""Rebuild denormalized submission thread counters from the messages table.
+
+Run after restoring data or editing messages by hand:
+    uv run python -m app.commands.recompute_counters [--submission ID]
+"""
+
+import argparse
+import asyncio
+
+from app.crud.submissions import recompute_thread_counters
+from app.database import AsyncSessionLocal, engine
+
+
+async def run(submission_id: str | None = None) -> list[str]:
+    async with AsyncSessionLocal() as db:
+        repaired = await recompute_thread_counters(db, submission_id)
+        await db.commit()
+    await engine.dispose()
+    return repaired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submission", help="only this submission id")
+    args = parser.parse_args()
+    repaired = asyncio.run(run(args.submission))
+    for submission_id in repaired:
+        print(f"repaired {submission_id}")
+    print(f"{len(repaired)} submission(s) had drifted counters")
+
+
+if __name__ == "__main__":
+    main()
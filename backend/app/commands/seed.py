@@ -0,0 +1,58 @@
+"""Seed the database: default seed user and projects, or a synthetic dataset for load tests.
+
+    uv run python -m app.commands.seed
+    uv run python -m app.commands.seed --users 1000 --projects 5000 --submissions 20000 --messages 200000
+
+Rows are bulk-inserted (INSERT ... ON CONFLICT for the defaults, COPY for synthetic data).
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.config import DEFAULT_SEED_PASSWORD, IS_PRODUCTION, SEED_PASSWORD
+from app.database import AsyncSessionLocal, engine
+from app.seed import seed_defaults, seed_synthetic
+
+
+async def run(args: argparse.Namespace) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            if args.users or args.projects:
+                counts = await seed_synthetic(
+                    db,
+                    users=args.users,
+                    projects=args.projects,
+                    submissions=args.submissions,
+                    messages=args.messages,
+                    batch_size=args.batch_size,
+                    random_seed=args.random_seed,
+                )
+                summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+            else:
+                summary = f"{await seed_defaults(db)} default project(s)"
+            print(f"seeded {summary} in {time.perf_counter() - start:.1f}s")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=0, help="synthetic users")
+    parser.add_argument("--projects", type=int, default=0, help="synthetic projects")
+    parser.add_argument("--submissions", type=int, default=0, help="synthetic submissions")
+    parser.add_argument("--messages", type=int, default=0, help="synthetic messages")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="rows per COPY")
+    parser.add_argument("--random-seed", type=int, default=0)
+    args = parser.parse_args()
+    if (args.users or args.projects) and not (args.users and args.projects):
+        parser.error("synthetic data needs both --users and --projects")
+    # M-3: never create well-known credentials in production
+    if IS_PRODUCTION and SEED_PASSWORD == DEFAULT_SEED_PASSWORD:
+        parser.error("In production, SEED_PASSWORD must be set to a strong value.")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
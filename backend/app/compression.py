@@ -0,0 +1,158 @@
+"""Response compression negotiated by Accept-Encoding.
+
+gzip is always available; br (brotli package) and zstd (compression.zstd on Python
+3.14+, else the zstandard package) are used when importable. Among the encodings the
+client accepts, the highest q wins, ties going to ENCODERS order.
+
+Only bodies with a textual media type and a Content-Length of at least
+COMPRESSION_MIN_SIZE bytes are compressed; streamed responses (SSE, no Content-Length)
+pass through untouched. A compressed body
+gets a weak ETag (it is a different byte sequence of the same representation; our
+If-None-Match comparison is weak, so it still revalidates), and for GETs with an ETag
+the compressed bytes are kept in compressed_cache: a hot /projects/{id} is compressed
+once per version and encoding, not on every hit.
+"""
+
+import gzip
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import TTLCache
+from app.config import (
+    COMPRESSION_CACHE_SIZE,
+    COMPRESSION_CACHE_TTL_SECONDS,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+
+# Preference order on equal q: better ratio on text first
+ENCODERS: dict[str, Callable[[bytes], bytes]] = {}
+
+try:
+    import brotli
+except ImportError:
+    pass
+else:
+    # Quality 5: most of brotli's gain over gzip at comparable speed (11 is far slower)
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=5)
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard
+    except ImportError:
+        pass
+    else:
+        ENCODERS["zstd"] = zstandard.ZstdCompressor().compress
+else:
+    ENCODERS["zstd"] = zstd.compress
+
+# mtime=0 keeps the output deterministic for a given body
+ENCODERS["gzip"] = lambda body: gzip.compress(
+    body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0
+)
+
+# (path, query string, ETag, encoding) -> compressed body
+compressed_cache = TTLCache(COMPRESSION_CACHE_SIZE, ttl=COMPRESSION_CACHE_TTL_SECONDS)
+
+
+def negotiate(accept_encoding: str, available=ENCODERS) -> str | None:
+    """Encoding from available to use for an Accept-Encoding header (None: identity)."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = (p.strip() for p in part.split(";"))
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.lower()] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(media_type: str) -> bool:
+    media_type = media_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith("text/") or media_type.endswith(("json", "xml", "javascript"))
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing sized response bodies (see module docstring)."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if not _compressible(headers.get("content-type", "")):
+                    await send(message)
+                    return
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                length = headers.get("content-length")
+                if (
+                    encoding is None
+                    or message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    # No length: a stream, sent as it comes
+                    or length is None
+                    or int(length) < self.minimum_size
+                ):
+                    await send(message)
+                    return
+                # Held with the body, which may come in several chunks (BaseHTTPMiddleware)
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            held, start = start, None
+            compressed = self._compress(scope, held, b"".join(chunks), encoding)
+            headers = MutableHeaders(scope=held)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(held)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compress(self, scope: Scope, start: Message, body: bytes, encoding: str) -> bytes:
+        etag = Headers(raw=start["headers"]).get("etag")
+        if scope["method"] != "GET" or start["status"] != 200 or not etag:
+            return ENCODERS[encoding](body)
+        key = (scope["path"], scope["query_string"], etag, encoding)
+        compressed = compressed_cache.get(key)
+        if compressed is None:
+            compressed = ENCODERS[encoding](body)
+            compressed_cache.set(key, compressed)
+        return compressed
@@ -27,14 +27,101 @@ if _ENV == "production":
             "In production, CORS_ORIGINS must be set explicitly (e.g. https://app.toolme.example)."
         )
 
-# Seed (M-3): set RUN_SEED=false in production to skip seed user/projects
-RUN_SEED = os.getenv("RUN_SEED", "true").lower() in ("true", "1", "yes")
-# In production, if seed runs, a strong SEED_PASSWORD must be set
-SEED_PASSWORD = os.getenv("SEED_PASSWORD", "seed-change-me")
-if _ENV == "production" and RUN_SEED and SEED_PASSWORD == "seed-change-me":
-    raise SystemExit(
-        "In production with RUN_SEED enabled, SEED_PASSWORD must be set to a strong value."
-    )
+# Seed (M-3): only app.commands.seed creates seed data (never API startup). Its users get
+# SEED_PASSWORD; the command refuses the default in production.
+DEFAULT_SEED_PASSWORD = "seed-change-me"
+SEED_PASSWORD = os.getenv("SEED_PASSWORD", DEFAULT_SEED_PASSWORD)
+IS_PRODUCTION = _ENV == "production"
+
+# Apply pending schema migrations at startup (under an advisory lock). Set false to
+# require `python -m app.commands.migrate` as a deploy step; startup then fails fast
+# if the schema is behind.
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "true").lower() in ("true", "1", "yes")
+
+# Database connection pool (per worker): at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections.
+# DB_POOL_RECYCLE=-1 keeps connections forever; DB_STATEMENT_CACHE_SIZE=0 for pgbouncer
+# in transaction mode.
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("true", "1", "yes")
+DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# Read replicas (comma-separated URLs, empty = none). Read-only routes (get_read_db) are
+# spread over them; a client that wrote in the last REPLICA_STICKY_SECONDS reads from the
+# primary instead, so it sees its own writes despite replication lag.
+DATABASE_REPLICA_URLS = [
+    u.strip() for u in os.getenv("DATABASE_REPLICA_URL", "").split(",") if u.strip()
+]
+REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Cache-Control for public project reads. The list may be served by a CDN or reverse
+# proxy for PROJECT_LIST_MAX_AGE seconds (then stale while it revalidates); a single
+# project is always revalidated with its ETag, which costs one indexed lookup.
+PROJECT_LIST_MAX_AGE: int = int(os.getenv("PROJECT_LIST_MAX_AGE", "30"))
+PROJECT_LIST_STALE_WHILE_REVALIDATE: int = int(
+    os.getenv("PROJECT_LIST_STALE_WHILE_REVALIDATE", "60")
+)
+
+# Per-worker cache of public project reads: GET /projects/{id} and list pages that start
+# within PROJECT_LIST_CACHE_DEPTH rows. Entries are full projects (descriptions up to
+# 50k chars), so keep sizes moderate. A size or TTL of 0 disables a cache.
+PROJECT_CACHE_TTL_SECONDS: float = float(os.getenv("PROJECT_CACHE_TTL_SECONDS", "30"))
+PROJECT_CACHE_SIZE: int = int(os.getenv("PROJECT_CACHE_SIZE", "1000"))
+PROJECT_LIST_CACHE_SIZE: int = int(os.getenv("PROJECT_LIST_CACHE_SIZE", "100"))
+PROJECT_LIST_CACHE_DEPTH: int = int(os.getenv("PROJECT_LIST_CACHE_DEPTH", "100"))
+# How other workers hear about writes: "postgres" (trigger + LISTEN/NOTIFY) or "none"
+# (single worker, or accept staleness up to the TTL)
+CACHE_INVALIDATION_BACKEND = os.getenv("CACHE_INVALIDATION_BACKEND", "postgres").lower()
+
+# Rows deleted per transaction by DELETE /projects/{id}?background=true
+PROJECT_PURGE_BATCH_SIZE: int = int(os.getenv("PROJECT_PURGE_BATCH_SIZE", "5000"))
+
+# Password hashing (bcrypt) runs on a bounded thread pool, off the event loop.
+# Requests beyond workers + queue get 503 instead of piling up behind a login storm.
+PASSWORD_HASH_WORKERS: int = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))),
+)
+PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# Per-worker auth caches. Users are re-read after USER_CACHE_TTL_SECONDS at the latest
+# (changes made through the ORM invalidate immediately); verified tokens are kept until
+# their exp. Set a TTL or size to 0 to disable.
+USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# Response compression (app.compression): bodies smaller than COMPRESSION_MIN_SIZE bytes
+# are sent as is. Compressed bodies of GETs with an ETag are cached per worker, keyed by
+# the ETag (COMPRESSION_CACHE_SIZE entries; 0 disables).
+COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_CACHE_SIZE: int = int(os.getenv("COMPRESSION_CACHE_SIZE", "500"))
+COMPRESSION_CACHE_TTL_SECONDS: float = float(
+    os.getenv("COMPRESSION_CACHE_TTL_SECONDS", "3600")
+)
+
+# Prometheus metrics (GET /metrics, app.prometheus): unauthenticated, so off by default
+# in production; enable it there only behind something that keeps it private. With
+# several workers, point METRICS_DIR at a directory shared by them (emptied before
+# start) so any worker's scrape reports all of them; each writes its samples there
+# every METRICS_WRITE_INTERVAL.
+EXPOSE_METRICS = os.getenv(
+    "EXPOSE_METRICS", "false" if _ENV == "production" else "true"
+).lower() in ("true", "1", "yes")
+METRICS_DIR: str | None = os.getenv("METRICS_DIR") or None
+METRICS_WRITE_INTERVAL: float = float(os.getenv("METRICS_WRITE_INTERVAL", "5"))
+
+# Internal stats endpoint (/internal/stats): on by default except in production
+EXPOSE_INTERNAL_STATS = os.getenv(
+    "EXPOSE_INTERNAL_STATS", "false" if _ENV == "production" else "true"
+).lower() in ("true", "1", "yes")
+
+# X-DB-Queries / Server-Timing response headers (query count and DB time per request)
+QUERY_STATS_HEADER = os.getenv(
+    "QUERY_STATS_HEADER", "false" if _ENV == "production" else "true"
+).lower() in ("true", "1", "yes")
 
 # HTTP-only auth cookie (E-2): Secure in production, SameSite=Lax
 AUTH_COOKIE_NAME = "toolme_access_token"
@@ -1,8 +1,71 @@
-from sqlalchemy import func, select
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, event, func, insert, literal_column, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache import LoadingCache
+from app.cache_invalidation import invalidator
+from app.config import (
+    PROJECT_CACHE_SIZE,
+    PROJECT_CACHE_TTL_SECONDS,
+    PROJECT_LIST_CACHE_DEPTH,
+    PROJECT_LIST_CACHE_SIZE,
+    PROJECT_PURGE_BATCH_SIZE,
+)
+from app.database import AsyncSessionLocal, reads_replica
+from app.fields import Fields, construct, select_columns
+from app.models.message import Message
+from app.models.project import SEARCH_CONFIG, Project
+from app.models.submission import Submission
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectListResponse,
+    ProjectResponse,
+    ProjectSummary,
+    ProjectSummaryListResponse,
+    ProjectUpdate,
+)
+
+# Public reads (per worker): ProjectResponse by id, ProjectListResponse by page params.
+# Writes below drop entries here; other workers hear through app.cache_invalidation.
+# Only primary reads fill them: a lagging replica would re-cache a row right after its
+# invalidation, for every reader (sticky ones included) until the TTL.
+project_cache = LoadingCache(PROJECT_CACHE_SIZE, ttl=PROJECT_CACHE_TTL_SECONDS)
+project_list_cache = LoadingCache(PROJECT_LIST_CACHE_SIZE, ttl=PROJECT_CACHE_TTL_SECONDS)
+
+_PENDING_INVALIDATIONS = "invalidate_projects"
+
+
+def invalidate_project(project_id: str | None) -> None:
+    """Drop a project and all cached list pages from this worker's caches
+    (project_id None: only the list pages, e.g. after an insert).
+    """
+    if project_id is not None:
+        project_cache.invalidate(project_id)
+    project_list_cache.clear()
+
+
+def clear_project_caches() -> None:
+    project_cache.clear()
+    project_list_cache.clear()
 
-from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectListResponse, ProjectResponse, ProjectUpdate
+
+invalidator.register("projects", invalidate_project, clear_project_caches)
+
+
+def _invalidate_on_commit(db: AsyncSession, project_id: str | None) -> None:
+    # Now, and again once committed: a concurrent read may re-cache the old row meanwhile
+    invalidate_project(project_id)
+    db.sync_session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(project_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for project_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_project(project_id)
 
 
 def _row_to_response(row: Project) -> ProjectResponse:
@@ -16,6 +79,39 @@ def _row_to_response(row: Project) -> ProjectResponse:
         delivery_instructions=row.delivery_instructions,
         user_id=row.user_id,
         created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+# Reads select plain columns (no ORM instances, identity map or change tracking) and turn
+# a page of rows into models with one pydantic-core call instead of a constructor per row
+_PROJECT_COLUMNS = select_columns(Project, ProjectResponse.model_fields)
+_project_items = TypeAdapter(list[ProjectResponse])
+
+# Columns behind ProjectSummary; the descriptions (up to 50k chars each) stay in the table
+_SUMMARY_COLUMNS = select_columns(Project, ProjectSummary.model_fields)
+_summary_items = TypeAdapter(list[ProjectSummary])
+
+# Loaded with ?fields= whatever was asked: the keyset cursor and ETags need them
+_SPARSE_ALWAYS = frozenset({"id", "created_at", "updated_at"})
+
+
+def _projection(summary: bool = False, fields: Fields | None = None):
+    """Columns to select and rows -> items function for a view.
+    fields takes precedence over summary.
+    """
+    if fields is not None:
+        loaded = fields | _SPARSE_ALWAYS
+        return (
+            select_columns(Project, loaded),
+            lambda rows: [construct(ProjectResponse, r, loaded) for r in rows],
+        )
+    if summary:
+        return _SUMMARY_COLUMNS, lambda rows: _summary_items.validate_python(
+            rows, from_attributes=True
+        )
+    return _PROJECT_COLUMNS, lambda rows: _project_items.validate_python(
+        rows, from_attributes=True
     )
 
 
@@ -28,56 +124,172 @@ async def list_projects(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 20,
+    after: str | None = None,
+    include_total: bool | None = None,
+    summary: bool = False,
+    fields: Fields | None = None,
+) -> ProjectListResponse | ProjectSummaryListResponse:
+    """Newest first. With after (cursor from a previous next_cursor), seek on
+    (created_at, id) instead of OFFSET and skip the count unless include_total.
+    summary selects only the ProjectSummary columns, fields only those fields (items are
+    then partial ProjectResponse models, for sparse_response).
+    Raises InvalidCursor if after cannot be decoded.
+    """
+    columns, to_items = _projection(summary, fields)
+    query = select(*columns).order_by(Project.created_at.desc(), Project.id.desc())
+    if after is not None:
+        created_at, row_id = decode_cursor(after)
+        query = query.where(
+            tuple_(Project.created_at, Project.id) < tuple_(created_at, row_id)
+        )
+        if include_total is None:
+            include_total = False
+    else:
+        query = query.offset(skip)
+        if include_total is None:
+            include_total = True
+    # One extra row tells us whether there is a next page
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    total = await count_projects(db) if include_total else None
+    page_class = ProjectSummaryListResponse if summary and fields is None else ProjectListResponse
+    return page_class(
+        items=to_items(rows),
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
+async def list_projects_cached(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 20,
+    after: str | None = None,
+    include_total: bool | None = None,
+    summary: bool = False,
+    fields: Fields | None = None,
+) -> ProjectListResponse | ProjectSummaryListResponse:
+    """list_projects through project_list_cache for the first pages (offset below
+    PROJECT_LIST_CACHE_DEPTH); cursor pages always go to the database. On a replica
+    session a cached page is used but a miss is not stored.
+    """
+
+    def load():
+        return list_projects(
+            db,
+            skip=skip,
+            limit=limit,
+            after=after,
+            include_total=include_total,
+            summary=summary,
+            fields=fields,
+        )
+
+    if after is not None or skip >= PROJECT_LIST_CACHE_DEPTH:
+        return await load()
+    key = (skip, limit, include_total, summary, fields)
+    if reads_replica(db):
+        return project_list_cache.get(key) or await load()
+    return await project_list_cache.get_or_load(key, load)
+
+
+async def search_projects(
+    db: AsyncSession,
+    q: str,
+    skip: int = 0,
+    limit: int = 20,
 ) -> ProjectListResponse:
-    total = await count_projects(db)
+    """Full-text search over title, domain and descriptions, best match first.
+    q uses web search syntax ("quoted phrase", -excluded, or).
+    """
+    ts_query = func.websearch_to_tsquery(
+        literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q
+    )
+    matches = Project.search_vector.op("@@")(ts_query)
+    rank = func.ts_rank_cd(Project.search_vector, ts_query)
+    total_result = await db.execute(
+        select(func.count()).select_from(Project).where(matches)
+    )
+    total = total_result.scalar_one() or 0
     result = await db.execute(
-        select(Project)
-        .order_by(Project.created_at.desc())
+        select(*_PROJECT_COLUMNS)
+        .where(matches)
+        .order_by(rank.desc(), Project.created_at.desc(), Project.id.desc())
         .offset(skip)
         .limit(limit)
     )
-    rows = result.scalars().all()
     return ProjectListResponse(
-        items=[_row_to_response(r) for r in rows],
+        items=_project_items.validate_python(result.all(), from_attributes=True),
         total=total,
     )
 
 
 async def list_projects_by_owner(
-    db: AsyncSession, user_id: str
-) -> list[ProjectResponse]:
+    db: AsyncSession, user_id: str, summary: bool = False, fields: Fields | None = None
+) -> list[ProjectResponse] | list[ProjectSummary]:
+    columns, to_items = _projection(summary, fields)
     result = await db.execute(
-        select(Project)
+        select(*columns)
         .where(Project.user_id == user_id)
         .order_by(Project.created_at.desc())
     )
-    rows = result.scalars().all()
-    return [_row_to_response(r) for r in rows]
+    return to_items(result.all())
 
 
-async def get_project(db: AsyncSession, project_id: str) -> ProjectResponse | None:
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    row = result.scalar_one_or_none()
-    if not row:
+async def get_project(
+    db: AsyncSession, project_id: str, fields: Fields | None = None
+) -> ProjectResponse | None:
+    columns, to_items = _projection(fields=fields)
+    result = await db.execute(select(*columns).where(Project.id == project_id))
+    row = result.one_or_none()
+    if row is None:
         return None
-    return _row_to_response(row)
+    return to_items([row])[0]
+
+
+async def get_project_cached(
+    db: AsyncSession, project_id: str, fields: Fields | None = None
+) -> ProjectResponse | None:
+    """get_project through project_cache; concurrent misses for one id share one query.
+    With fields, a cached project is returned whole, else only those columns are read
+    (and not cached); the same goes for a replica session. The returned model is
+    shared: do not modify it.
+    """
+    if fields is not None or reads_replica(db):
+        return project_cache.get(project_id) or await get_project(db, project_id, fields)
+    return await project_cache.get_or_load(project_id, lambda: get_project(db, project_id))
+
+
+async def get_project_version(db: AsyncSession, project_id: str) -> datetime | None:
+    """updated_at alone (for ETag checks, without loading the descriptions)."""
+    cached = project_cache.get(project_id)
+    if cached is not None:
+        return cached.updated_at
+    return await db.scalar(select(Project.updated_at).where(Project.id == project_id))
 
 
 async def create_project(
     db: AsyncSession, payload: ProjectCreate, user_id: str
 ) -> ProjectResponse:
-    project = Project(
-        title=payload.title,
-        domain=payload.domain,
-        short_description=payload.short_description,
-        full_description=payload.full_description,
-        deadline=payload.deadline,
-        delivery_instructions=payload.delivery_instructions,
-        user_id=user_id,
+    # Single INSERT ... RETURNING instead of flush + refresh
+    project = await db.scalar(
+        insert(Project)
+        .values(
+            title=payload.title,
+            domain=payload.domain,
+            short_description=payload.short_description,
+            full_description=payload.full_description,
+            deadline=payload.deadline,
+            delivery_instructions=payload.delivery_instructions,
+            user_id=user_id,
+        )
+        .returning(Project)
     )
-    db.add(project)
-    await db.flush()
-    await db.refresh(project)
+    _invalidate_on_commit(db, None)
     return _row_to_response(project)
 
 
@@ -93,15 +305,59 @@ async def update_project(
         setattr(row, key, value)
     await db.flush()
     await db.refresh(row)
+    _invalidate_on_commit(db, project_id)
     return _row_to_response(row)
 
 
 async def delete_project(
     db: AsyncSession, project_id: str, user_id: str
 ) -> bool:
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    row = result.scalar_one_or_none()
-    if not row or row.user_id != user_id:
+    """Delete the project in one statement; submissions and messages go through the FK
+    ON DELETE CASCADE. Returns False if not found or not the owner.
+    """
+    result = await db.execute(
+        delete(Project)
+        .where(Project.id == project_id, Project.user_id == user_id)
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
         return False
-    await db.delete(row)
+    _invalidate_on_commit(db, project_id)
     return True
+
+
+async def is_project_owner(db: AsyncSession, project_id: str, user_id: str) -> bool:
+    owner_id = await db.scalar(select(Project.user_id).where(Project.id == project_id))
+    return owner_id == user_id
+
+
+async def purge_project(project_id: str, batch_size: int = PROJECT_PURGE_BATCH_SIZE) -> None:
+    """Delete a project with many submissions/messages in batches, one short transaction
+    per batch (background purge: no long-held locks, no huge single transaction).
+    Safe to re-run if interrupted.
+    """
+    submission_ids = select(Submission.id).where(Submission.project_id == project_id)
+    batches = (
+        (Message, select(Message.id).where(Message.submission_id.in_(submission_ids))),
+        (Submission, submission_ids),
+    )
+    for model, ids in batches:
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    delete(model)
+                    .where(model.id.in_(ids.limit(batch_size).scalar_subquery()))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            if result.rowcount < batch_size:
+                break
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(Project)
+            .where(Project.id == project_id)
+            .execution_options(synchronize_session=False)
+        )
+        _invalidate_on_commit(db, project_id)
+        await db.commit()
@@ -1,14 +1,21 @@
-from datetime import datetime, timezone
+import uuid
+from dataclasses import dataclass
+from typing import Literal
 
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import String, and_, case, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.events import publish_message, publish_unread
+from app.fields import Fields, construct, select_columns
 from app.models.message import Message
 from app.models.project import Project
 from app.models.submission import Submission
+from app.pagination import decode_cursor, encode_cursor
 from app.schemas.submission import (
     MessageCreate,
+    MessagePageResponse,
     MessageResponse,
     SubmissionCreate,
     SubmissionCoherentUpdate,
@@ -17,19 +24,49 @@ from app.schemas.submission import (
 )
 
 
-def _message_to_response(m: Message) -> MessageResponse:
-    return MessageResponse(
-        id=m.id,
-        submission_id=m.submission_id,
-        sender_id=m.sender_id,
-        body=m.body,
-        created_at=m.created_at,
-    )
+class DuplicateSubmission(Exception):
+    """The learner already has a submission for this project (one per project)."""
+
+
+@dataclass(frozen=True)
+class SubmissionAccess:
+    """A submission plus who the caller is in its thread (role None: neither learner nor
+    owner). Loaded once per request and passed to the CRUD functions so they skip
+    reloading the submission.
+    """
+
+    submission: Submission
+    owner_id: str
+    role: Literal["learner", "owner"] | None
+
+
+async def load_submission_access(
+    db: AsyncSession,
+    submission_id: str,
+    user_id: str,
+) -> SubmissionAccess | None:
+    """Submission and its project owner in one joined query (None if not found)."""
+    row = (
+        await db.execute(
+            select(Submission, Project.user_id)
+            .join(Project, Project.id == Submission.project_id)
+            .where(Submission.id == submission_id)
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    submission, owner_id = row
+    if submission.learner_id == user_id:
+        role = "learner"
+    elif owner_id == user_id:
+        role = "owner"
+    else:
+        role = None
+    return SubmissionAccess(submission, owner_id, role)
 
 
 def _submission_to_response(
     s: Submission,
-    message_count: int = 0,
     unread_count: int = 0,
 ) -> SubmissionResponse:
     return SubmissionResponse(
@@ -40,28 +77,40 @@ def _submission_to_response(
         file_ref=s.file_ref,
         created_at=s.created_at,
         coherent=s.coherent,
-        message_count=message_count,
+        message_count=s.message_count,
         unread_count=unread_count,
+        last_message_at=s.last_message_at,
+        last_message_sender_id=s.last_message_sender_id,
     )
 
 
-def _unread_for_learner(s: Submission) -> int:
-    """Count messages from owner (not learner) after learner_last_read_at."""
-    cutoff = s.learner_last_read_at
-    return sum(
-        1
-        for m in s.messages
-        if m.sender_id != s.learner_id and (cutoff is None or m.created_at > cutoff)
+# Lists select plain columns and build a page of models in one pydantic-core call
+_MESSAGE_COLUMNS = select_columns(Message, MessageResponse.model_fields)
+_message_items = TypeAdapter(list[MessageResponse])
+_submission_items = TypeAdapter(list[SubmissionResponse])
+
+
+def _submission_projection(fields: Fields | None, unread_column):
+    """Columns to select (all by default) and rows -> SubmissionResponse items,
+    unread_count being read from unread_column (the viewer's side).
+    """
+    columns = select_columns(
+        Submission,
+        SubmissionResponse.model_fields if fields is None else fields,
+        columns={"unread_count": unread_column},
     )
+    if fields is None:
+        return columns, lambda rows: _submission_items.validate_python(
+            rows, from_attributes=True
+        )
+    return columns, lambda rows: [construct(SubmissionResponse, r, fields) for r in rows]
 
 
-def _unread_for_owner(s: Submission, owner_id: str) -> int:
-    """Count messages from learner after owner_last_read_at."""
-    cutoff = s.owner_last_read_at
-    return sum(
-        1
-        for m in s.messages
-        if m.sender_id != owner_id and (cutoff is None or m.created_at > cutoff)
+def _unread_since(sender_filter, last_read_at):
+    """Messages matching sender_filter created after last_read_at (all if never read)."""
+    return and_(
+        sender_filter,
+        or_(last_read_at.is_(None), Message.created_at > last_read_at),
     )
 
 
@@ -72,19 +121,15 @@ async def get_submission_by_project_and_learner(
 ) -> SubmissionResponse | None:
     """Return the learner's submission for this project if any (at most one per project/learner)."""
     result = await db.execute(
-        select(Submission)
-        .where(
+        select(Submission).where(
             Submission.project_id == project_id,
             Submission.learner_id == learner_id,
         )
-        .options(selectinload(Submission.messages))
     )
     s = result.scalar_one_or_none()
     if not s:
         return None
-    return _submission_to_response(
-        s, message_count=len(s.messages), unread_count=_unread_for_learner(s)
-    )
+    return _submission_to_response(s, unread_count=s.learner_unread_count)
 
 
 async def create_submission(
@@ -93,30 +138,55 @@ async def create_submission(
     learner_id: str,
     payload: SubmissionCreate,
 ) -> SubmissionResponse | None:
-    """Create a submission with the initial message. Returns None if project not found.
-    Caller must ensure at most one submission per (project, learner) — check first with
-    get_submission_by_project_and_learner.
+    """Create a submission with the initial message. Returns None if project not found,
+    raises DuplicateSubmission if the learner already has one for this project.
+
+    Two statements: INSERT ... SELECT from the project ON CONFLICT DO NOTHING RETURNING,
+    then the message insert. The extra project lookup only runs when nothing was inserted.
     """
-    project = await db.get(Project, project_id)
-    if not project:
-        return None
-    submission = Submission(
-        project_id=project_id,
-        learner_id=learner_id,
-        link=payload.link,
-        file_ref=payload.file_ref,
+    result = await db.execute(
+        insert(Submission)
+        .from_select(
+            [
+                "id",
+                "project_id",
+                "learner_id",
+                "link",
+                "file_ref",
+                "message_count",
+                "last_message_at",
+                "last_message_sender_id",
+                "owner_unread_count",
+            ],
+            select(
+                literal(str(uuid.uuid4())),
+                Project.id,
+                literal(learner_id),
+                literal(payload.link, String),
+                literal(payload.file_ref, String),
+                # Counters for the initial message (same transaction time as its created_at)
+                literal(1),
+                func.now(),
+                literal(learner_id),
+                case((Project.user_id == learner_id, 0), else_=1),
+            ).where(Project.id == project_id),
+        )
+        .on_conflict_do_nothing(constraint="uq_submission_project_learner")
+        .returning(Submission)
     )
-    db.add(submission)
-    await db.flush()
-    message = Message(
-        submission_id=submission.id,
-        sender_id=learner_id,
-        body=payload.message,
+    submission = result.scalar_one_or_none()
+    if submission is None:
+        if await db.scalar(select(Project.id).where(Project.id == project_id)) is None:
+            return None
+        raise DuplicateSubmission()
+    await db.execute(
+        insert(Message).values(
+            submission_id=submission.id,
+            sender_id=learner_id,
+            body=payload.message,
+        )
     )
-    db.add(message)
-    await db.flush()
-    await db.refresh(submission)
-    return _submission_to_response(submission, message_count=1, unread_count=0)
+    return _submission_to_response(submission, unread_count=0)
 
 
 async def get_submission(
@@ -129,15 +199,31 @@ async def get_submission(
 async def get_submission_with_messages(
     db: AsyncSession,
     submission_id: str,
+    messages_limit: int | None = None,
+    access: SubmissionAccess | None = None,
 ) -> SubmissionWithMessagesResponse | None:
-    result = await db.execute(
-        select(Submission)
-        .where(Submission.id == submission_id)
-        .options(selectinload(Submission.messages))
-    )
-    s = result.scalar_one_or_none()
-    if not s:
-        return None
+    """Submission with its thread; with messages_limit, only the last N messages are
+    embedded and messages_before_cursor points at the older ones. Pass the route's
+    access to reuse its already loaded submission.
+    """
+    if access is not None:
+        s = access.submission
+    else:
+        s = await db.get(Submission, submission_id)
+        if not s:
+            return None
+    if messages_limit is None:
+        result = await db.execute(
+            select(*_MESSAGE_COLUMNS)
+            .where(Message.submission_id == submission_id)
+            .order_by(Message.created_at, Message.id)
+        )
+        messages = _message_items.validate_python(result.all(), from_attributes=True)
+        before_cursor = None
+    else:
+        page = await list_messages(db, submission_id, limit=messages_limit)
+        messages = page.items
+        before_cursor = page.before_cursor if page.has_older else None
     return SubmissionWithMessagesResponse(
         id=s.id,
         project_id=s.project_id,
@@ -146,53 +232,85 @@ async def get_submission_with_messages(
         file_ref=s.file_ref,
         created_at=s.created_at,
         coherent=s.coherent,
-        message_count=len(s.messages),
+        message_count=s.message_count,
         unread_count=0,
-        messages=[_message_to_response(m) for m in s.messages],
+        last_message_at=s.last_message_at,
+        last_message_sender_id=s.last_message_sender_id,
+        messages=messages,
+        messages_before_cursor=before_cursor,
+    )
+
+
+async def list_messages(
+    db: AsyncSession,
+    submission_id: str,
+    before: str | None = None,
+    after: str | None = None,
+    limit: int = 50,
+) -> MessagePageResponse:
+    """One page of a thread, oldest first, seeking on (created_at, id).
+    No cursor: the latest messages. before: older than the cursor. after: newer than the
+    cursor (both: the range in between, from after). Raises InvalidCursor on a bad token.
+    """
+    key = tuple_(Message.created_at, Message.id)
+    query = select(*_MESSAGE_COLUMNS).where(Message.submission_id == submission_id)
+    if before is not None:
+        query = query.where(key < tuple_(*decode_cursor(before)))
+    if after is not None:
+        query = query.where(key > tuple_(*decode_cursor(after)))
+        result = await db.execute(
+            query.order_by(Message.created_at, Message.id).limit(limit + 1)
+        )
+        rows = result.all()
+        has_older = True
+        has_newer = len(rows) > limit or before is not None
+        rows = rows[:limit]
+    else:
+        result = await db.execute(
+            query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1)
+        )
+        rows = result.all()
+        has_older = len(rows) > limit
+        has_newer = before is not None
+        rows = rows[:limit][::-1]
+    return MessagePageResponse(
+        items=_message_items.validate_python(rows, from_attributes=True),
+        before_cursor=encode_cursor(rows[0].created_at, rows[0].id) if rows else before,
+        after_cursor=encode_cursor(rows[-1].created_at, rows[-1].id) if rows else after,
+        has_older=has_older,
+        has_newer=has_newer,
     )
 
 
 async def list_submissions_by_learner(
     db: AsyncSession,
     learner_id: str,
+    fields: Fields | None = None,
 ) -> list[SubmissionResponse]:
+    """fields: only those columns (partial models, for sparse_response)."""
+    columns, to_items = _submission_projection(fields, Submission.learner_unread_count)
     result = await db.execute(
-        select(Submission)
+        select(*columns)
         .where(Submission.learner_id == learner_id)
-        .options(selectinload(Submission.messages))
         .order_by(Submission.created_at.desc())
     )
-    rows = result.scalars().unique().all()
-    return [
-        _submission_to_response(
-            s,
-            message_count=len(s.messages),
-            unread_count=_unread_for_learner(s),
-        )
-        for s in rows
-    ]
+    return to_items(result.all())
 
 
 async def list_submissions_by_project(
     db: AsyncSession,
     project_id: str,
     owner_id: str,
+    fields: Fields | None = None,
 ) -> list[SubmissionResponse]:
+    """fields: only those columns (partial models, for sparse_response)."""
+    columns, to_items = _submission_projection(fields, Submission.owner_unread_count)
     result = await db.execute(
-        select(Submission)
+        select(*columns)
         .where(Submission.project_id == project_id)
-        .options(selectinload(Submission.messages))
         .order_by(Submission.created_at.desc())
     )
-    rows = result.scalars().unique().all()
-    return [
-        _submission_to_response(
-            s,
-            message_count=len(s.messages),
-            unread_count=_unread_for_owner(s, owner_id),
-        )
-        for s in rows
-    ]
+    return to_items(result.all())
 
 
 async def update_submission_coherent(
@@ -200,46 +318,51 @@ async def update_submission_coherent(
     submission_id: str,
     payload: SubmissionCoherentUpdate,
     owner_id: str,
+    access: SubmissionAccess | None = None,
 ) -> SubmissionResponse | None:
     """Owner of the project can set coherent. Returns None if not found or not owner."""
-    result = await db.execute(
-        select(Submission)
-        .where(Submission.id == submission_id)
-        .options(selectinload(Submission.project), selectinload(Submission.messages))
-    )
-    s = result.scalar_one_or_none()
-    if not s or s.project.user_id != owner_id:
+    if access is None:
+        access = await load_submission_access(db, submission_id, owner_id)
+    # owner_id, not role: an owner who applied to their own project is "learner" there
+    if access is None or access.owner_id != owner_id:
         return None
+    s = access.submission
     s.coherent = payload.coherent
     await db.flush()
     await db.refresh(s)
-    return _submission_to_response(
-        s, message_count=len(s.messages), unread_count=0
-    )
+    return _submission_to_response(s, unread_count=0)
 
 
 async def mark_submission_read(
     db: AsyncSession,
     submission_id: str,
     user_id: str,
+    access: SubmissionAccess | None = None,
 ) -> bool:
     """Mark thread as read for the current user (learner or owner). Returns True if updated."""
-    result = await db.execute(
-        select(Submission)
-        .where(Submission.id == submission_id)
-        .options(selectinload(Submission.project))
-    )
-    s = result.scalar_one_or_none()
-    if not s:
+    if access is None:
+        access = await load_submission_access(db, submission_id, user_id)
+    if access is None or access.role is None:
         return False
-    now = datetime.now(timezone.utc)
-    if s.learner_id == user_id:
-        s.learner_last_read_at = now
-    elif s.project.user_id == user_id:
-        s.owner_last_read_at = now
+    # The database clock, as for message created_at: unread counts compare the two
+    if access.role == "learner":
+        values = {
+            Submission.learner_last_read_at: func.now(),
+            Submission.learner_unread_count: 0,
+        }
     else:
-        return False
-    await db.flush()
+        values = {
+            Submission.owner_last_read_at: func.now(),
+            Submission.owner_unread_count: 0,
+        }
+    await db.execute(
+        update(Submission)
+        .where(Submission.id == submission_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    db.expire(access.submission)
+    await publish_unread(db, submission_id, user_id, 0)
     return True
 
 
@@ -248,20 +371,137 @@ async def add_message(
     submission_id: str,
     sender_id: str,
     payload: MessageCreate,
+    access: SubmissionAccess | None = None,
 ) -> MessageResponse | None:
-    """Add a message to the thread. Caller must ensure sender is learner or project owner."""
-    submission = await db.get(Submission, submission_id)
-    if not submission:
+    """Add a message to the thread. Caller must ensure sender is learner or project owner
+    (routes pass their access, which also saves reloading the submission).
+    """
+    if access is None and await db.get(Submission, submission_id) is None:
         return None
-    message = Message(
+    # One statement: insert the message and bump the counters from its created_at, so
+    # concurrent posts cannot lose increments
+    message = (
+        insert(Message)
+        .values(submission_id=submission_id, sender_id=sender_id, body=payload.body)
+        .returning(Message.id, Message.submission_id, Message.created_at)
+        .cte("new_message")
+    )
+    owner_id = (
+        select(Project.user_id)
+        .where(Project.id == Submission.project_id)
+        .scalar_subquery()
+    )
+    is_latest = or_(
+        Submission.last_message_at.is_(None),
+        Submission.last_message_at <= message.c.created_at,
+    )
+    result = await db.execute(
+        update(Submission)
+        .where(Submission.id == message.c.submission_id)
+        .values(
+            message_count=Submission.message_count + 1,
+            last_message_at=func.greatest(Submission.last_message_at, message.c.created_at),
+            last_message_sender_id=case(
+                (is_latest, sender_id), else_=Submission.last_message_sender_id
+            ),
+            learner_unread_count=Submission.learner_unread_count
+            + case((Submission.learner_id != sender_id, 1), else_=0),
+            owner_unread_count=Submission.owner_unread_count
+            + case((owner_id != sender_id, 1), else_=0),
+        )
+        .returning(
+            Submission.learner_id,
+            Submission.learner_unread_count,
+            owner_id,
+            Submission.owner_unread_count,
+            message.c.id,
+            message.c.created_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    (
+        learner_id,
+        learner_unread,
+        thread_owner_id,
+        owner_unread,
+        message_id,
+        created_at,
+    ) = result.one()
+    if access is not None:
+        # Counters changed underneath the loaded row
+        db.expire(access.submission)
+    response = MessageResponse(
+        id=message_id,
         submission_id=submission_id,
         sender_id=sender_id,
         body=payload.body,
+        created_at=created_at,
     )
-    db.add(message)
-    await db.flush()
-    await db.refresh(message)
-    return _message_to_response(message)
+    # Streams of both sides get the message and their new unread count (sent on commit)
+    recipients = {thread_owner_id: owner_unread, learner_id: learner_unread}
+    await publish_message(db, response, recipients)
+    return response
+
+
+async def recompute_thread_counters(
+    db: AsyncSession,
+    submission_id: str | None = None,
+) -> list[str]:
+    """Rebuild thread counters from the messages table (all submissions, or one).
+    Unread counts follow the last_read_at cutoffs. Returns ids of submissions that had drifted.
+    """
+    owner_id = Project.user_id
+    stats = (
+        select(
+            Submission.id.label("submission_id"),
+            func.count(Message.id).label("message_count"),
+            func.max(Message.created_at).label("last_message_at"),
+            array_agg(
+                aggregate_order_by(
+                    Message.sender_id, Message.created_at.desc(), Message.id.desc()
+                )
+            )[1].label("last_message_sender_id"),
+            func.count(Message.id)
+            .filter(
+                _unread_since(
+                    Message.sender_id != Submission.learner_id,
+                    Submission.learner_last_read_at,
+                )
+            )
+            .label("learner_unread_count"),
+            func.count(Message.id)
+            .filter(
+                _unread_since(
+                    Message.sender_id != owner_id, Submission.owner_last_read_at
+                )
+            )
+            .label("owner_unread_count"),
+        )
+        .join(Project, Project.id == Submission.project_id)
+        .outerjoin(Message, Message.submission_id == Submission.id)
+        .group_by(Submission.id, owner_id)
+    )
+    if submission_id is not None:
+        stats = stats.where(Submission.id == submission_id)
+    stats = stats.subquery()
+    columns = (
+        "message_count",
+        "last_message_at",
+        "last_message_sender_id",
+        "learner_unread_count",
+        "owner_unread_count",
+    )
+    drifted = or_(
+        *(getattr(Submission, c).is_distinct_from(stats.c[c]) for c in columns)
+    )
+    result = await db.execute(
+        update(Submission)
+        .where(Submission.id == stats.c.submission_id, drifted)
+        .values({c: stats.c[c] for c in columns})
+        .returning(Submission.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
 
 
 async def project_owner_id(db: AsyncSession, project_id: str) -> str | None:
@@ -1,10 +1,29 @@
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import hash_password
+from app.auth import hash_password_async
+from app.cache import TTLCache
+from app.config import USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserSignUp
 
+# Authenticated-user lookups by id (get_current_user); entries are detached User rows
+user_cache = TTLCache(USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: str) -> None:
+    """Drop a cached user. ORM updates/deletes do this automatically; call it after
+    bulk UPDATE/DELETE statements on users.
+    """
+    user_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
 
 def _row_to_response(row: User) -> UserResponse:
     return UserResponse(id=row.id, email=row.email)
@@ -12,15 +31,21 @@ def _row_to_response(row: User) -> UserResponse:
 
 async def create_user(
     db: AsyncSession, payload: UserCreate | UserSignUp
-) -> UserResponse:
-    user = User(
-        email=payload.email,
-        password_hash=hash_password(payload.password),
+) -> UserResponse | None:
+    """Insert the user in one statement. Returns None if the email is already registered
+    (the hash is computed either way, so the response time does not reveal which).
+    """
+    password_hash = await hash_password_async(payload.password)
+    result = await db.execute(
+        insert(User)
+        .values(email=payload.email, password_hash=password_hash)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id, User.email)
     )
-    db.add(user)
-    await db.flush()
-    await db.refresh(user)
-    return _row_to_response(user)
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return UserResponse(id=row.id, email=row.email)
 
 
 async def get_user_by_id(db: AsyncSession, user_id: str) -> User | None:
@@ -28,6 +53,18 @@ async def get_user_by_id(db: AsyncSession, user_id: str) -> User | None:
     return result.scalar_one_or_none()
 
 
+async def get_user_by_id_cached(db: AsyncSession, user_id: str) -> User | None:
+    """get_user_by_id through user_cache. The returned row is detached from db."""
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    user = await get_user_by_id(db, user_id)
+    if user is not None:
+        db.expunge(user)
+        user_cache.set(user_id, user)
+    return user
+
+
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     result = await db.execute(
         select(User).where(User.email == email.lower().strip())
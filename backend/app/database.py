@@ -1,9 +1,34 @@
 """Async database engine and session for PostgreSQL."""
 
+import itertools
 import os
+import threading
+import time
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import (
+    DATABASE_REPLICA_URLS,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    REPLICA_STICKY_SECONDS,
+)
+from app.metrics import Histogram
 
 # Build from env vars if DATABASE_URL not set (no password in default URL)
 if url := os.getenv("DATABASE_URL"):
@@ -16,10 +41,47 @@ else:
     dbname = os.getenv("POSTGRES_DB", "toolme")
     DATABASE_URL = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{dbname}"
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=os.getenv("SQL_ECHO", "0") == "1",
-)
+# Time spent obtaining a connection from the pool (includes opening a new one)
+pool_checkout_wait = Histogram()
+_pool_timeouts = 0
+_pool_timeouts_lock = threading.Lock()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time and timeouts."""
+
+    def _do_get(self):
+        global _pool_timeouts
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with _pool_timeouts_lock:
+                _pool_timeouts += 1
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=os.getenv("SQL_ECHO", "0") == "1",
+        poolclass=InstrumentedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={
+            # asyncpg's own cache and SQLAlchemy's prepared statement cache
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+engine = _create_engine(DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -28,8 +90,98 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Same pool, no BEGIN/COMMIT: each statement runs in its own implicit transaction
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+class ReplicaRouter:
+    """Picks the engine for read-only sessions: replicas round-robin, else the primary.
+
+    Clients that wrote recently carry STICKY_COOKIE (its value is the time until which
+    they stay on the primary), which keeps read-your-writes across workers.
+    """
+
+    STICKY_COOKIE = "toolme_primary_until"
+
+    def __init__(self, urls: list[str], sticky_seconds: float = REPLICA_STICKY_SECONDS):
+        self.engines = [_create_engine(url) for url in urls]
+        self.sticky_seconds = sticky_seconds
+        self._read_engines = [
+            e.execution_options(isolation_level="AUTOCOMMIT") for e in self.engines
+        ]
+        self._next = itertools.cycle(self._read_engines)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def is_sticky(self, request: Request) -> bool:
+        try:
+            return float(request.cookies.get(self.STICKY_COOKIE, "0")) > time.time()
+        except ValueError:
+            return False
+
+    def read_bind(self, request: Request) -> AsyncEngine:
+        # Reads made while handling a write (e.g. loading the current user) stay on the primary
+        if not self.enabled or request.method not in SAFE_METHODS or self.is_sticky(request):
+            return read_engine
+        return next(self._next)
+
+    def mark_write(self, response: Response) -> None:
+        if not self.enabled:
+            return
+        response.set_cookie(
+            self.STICKY_COOKIE,
+            f"{time.time() + self.sticky_seconds:.3f}",
+            max_age=max(int(self.sticky_seconds), 1),
+            httponly=True,
+            samesite="lax",
+        )
+
+    async def dispose(self) -> None:
+        for e in self.engines:
+            await e.dispose()
+
+
+replicas = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances):
+    if session.info.get("read_only"):
+        raise RuntimeError("Read-only session (get_read_db) cannot write; use get_db")
+
+
+def pool_stats() -> dict:
+    """Connection counts for this worker's pool plus checkout wait histogram."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # QueuePool counts overflow from -size; only connections beyond size are overflow
+        "overflow": max(pool.overflow(), 0),
+        "checkout_timeouts": _pool_timeouts,
+        "checkout_wait_seconds": pool_checkout_wait.snapshot(),
+    }
+
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    if request.method not in SAFE_METHODS:
+        # Set before the handler runs: the response is already sent when we resume
+        replicas.mark_write(response)
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -39,3 +191,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: autocommit, so no BEGIN/COMMIT round-trips, on a
+    replica when DATABASE_REPLICA_URL is set (primary for clients that just wrote).
+
+    Statements do not share a snapshot; use get_db when reads must be consistent
+    with each other or anything is written.
+    """
+    bind = replicas.read_bind(request)
+    async with ReadSessionLocal(bind=bind, info={"replica": bind is not read_engine}) as session:
+        yield session
+
+
+def reads_replica(db: AsyncSession) -> bool:
+    """True if db reads from a replica, which may lag behind the primary."""
+    return db.info.get("replica", False)
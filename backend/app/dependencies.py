@@ -1,13 +1,14 @@
-"""FastAPI dependencies for auth."""
+"""FastAPI dependencies for auth and per-resource access checks."""
 
 from fastapi import Cookie, Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import decode_access_token
+from app.auth import decode_access_token_cached
 from app.config import AUTH_COOKIE_NAME
-from app.crud.users import get_user_by_id
-from app.database import get_db
+from app.crud.submissions import SubmissionAccess, load_submission_access
+from app.crud.users import get_user_by_id_cached
+from app.database import ReadSessionLocal, get_db, get_read_db
 from app.models.user import User
 
 security = HTTPBearer(auto_error=False)
@@ -24,9 +25,18 @@ def _get_token(
     return cookie_token
 
 
+async def _load_user(user_id: str) -> User | None:
+    """The token's user, read from the primary even on replica-routed requests: a
+    replica may not have a user who just signed up yet (a bearer client carries no
+    sticky cookie), and user_cache must not keep replica rows. Own short session (no
+    connection at all on a cache hit), returned to the pool before the route runs.
+    """
+    async with ReadSessionLocal() as db:
+        return await get_user_by_id_cached(db, user_id)
+
+
 async def get_current_user(
     request: Request,
-    db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     cookie_token: str | None = Cookie(None, alias=AUTH_COOKIE_NAME),
 ) -> User:
@@ -37,14 +47,14 @@ async def get_current_user(
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if not payload or "sub" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = await get_user_by_id(db, payload["sub"])
+    user = await _load_user(payload["sub"])
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,14 +66,40 @@ async def get_current_user(
 
 async def get_current_user_optional(
     request: Request,
-    db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     cookie_token: str | None = Cookie(None, alias=AUTH_COOKIE_NAME),
 ) -> User | None:
     token = _get_token(request, credentials, cookie_token)
     if not token:
         return None
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if not payload or "sub" not in payload:
         return None
-    return await get_user_by_id(db, payload["sub"])
+    return await _load_user(payload["sub"])
+
+
+async def _submission_access(db: AsyncSession, submission_id: str, user: User) -> SubmissionAccess:
+    access = await load_submission_access(db, submission_id, user.id)
+    if access is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    if access.role is None:
+        raise HTTPException(status_code=403, detail="Not allowed to access this submission")
+    return access
+
+
+async def get_submission_access(
+    submission_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> SubmissionAccess:
+    """Learner or project owner of {submission_id}, loaded in the route's write session."""
+    return await _submission_access(db, submission_id, current_user)
+
+
+async def get_submission_read_access(
+    submission_id: str,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> SubmissionAccess:
+    """Same check as get_submission_access, in the read-only session."""
+    return await _submission_access(db, submission_id, current_user)
@@ -0,0 +1,223 @@
+"""Real-time thread events: Postgres LISTEN/NOTIFY fanned out to in-process subscribers.
+
+Writers call publish() inside their transaction (NOTIFY is delivered on commit and
+dropped on rollback). Each worker keeps one LISTEN connection and hands every event to
+the queues of the subscribed users, so many streams share a single DB listener and
+events cross uvicorn workers.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, engine
+from app.models.message import Message
+from app.schemas.submission import MessageResponse
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "toolme_events"
+# NOTIFY payloads must stay under 8000 bytes; larger messages are sent by id and re-read
+_MAX_INLINE_PAYLOAD = 7000
+# Events buffered per stream before a slow client starts missing them
+SUBSCRIBER_QUEUE_SIZE = 100
+_RECONNECT_DELAY_SECONDS = 2.0
+
+
+async def publish(db: AsyncSession, event: dict) -> None:
+    """NOTIFY event in the caller's transaction. event["recipients"] maps user id to the
+    unread count of event["submission_id"] for that user.
+    """
+    payload = json.dumps(event, separators=(",", ":"))
+    if len(payload) > _MAX_INLINE_PAYLOAD and "message" in event:
+        event = {**event, "message": None, "message_id": event["message"]["id"]}
+        payload = json.dumps(event, separators=(",", ":"))
+    await db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+async def publish_message(
+    db: AsyncSession, message: MessageResponse, recipients: dict[str, int]
+) -> None:
+    await publish(
+        db,
+        {
+            "type": "message",
+            "submission_id": message.submission_id,
+            "recipients": recipients,
+            "message": message.model_dump(mode="json"),
+        },
+    )
+
+
+async def publish_unread(db: AsyncSession, submission_id: str, user_id: str, unread: int) -> None:
+    await publish(
+        db,
+        {"type": "unread", "submission_id": submission_id, "recipients": {user_id: unread}},
+    )
+
+
+def _listener_dsn() -> str:
+    # asyncpg wants a plain postgresql:// URL (no SQLAlchemy driver suffix)
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class PgListener:
+    """One LISTEN connection on channel, calling on_notify(payload) for each NOTIFY.
+
+    Reconnects if the connection drops; on_connect runs after every (re)connect, since
+    notifications sent while disconnected are lost.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        dsn: str | None = None,
+        on_connect: Callable[[], None] | None = None,
+    ):
+        self._channel = channel
+        self._on_notify = on_notify
+        self._on_connect = on_connect
+        self._dsn = dsn
+        self._task: asyncio.Task | None = None
+        self._ready: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start listening if not already, and wait for the first connection attempt."""
+        if not self.running:
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+        await self._ready.wait()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self._dsn or _listener_dsn())
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: closed.set())
+                await conn.add_listener(
+                    self._channel, lambda _conn, _pid, _channel, payload: self._on_notify(payload)
+                )
+                if self._on_connect is not None:
+                    self._on_connect()
+                self._ready.set()
+                await closed.wait()
+                logger.warning("Listener connection on %s lost, reconnecting", self._channel)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Listener on %s failed, retrying", self._channel)
+                # Do not leave callers waiting forever on a dead database
+                self._ready.set()
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+
+class EventBroker:
+    """Subscriber registry for this process plus the single LISTEN connection feeding it.
+    The listener starts with the first subscriber and reconnects if the connection drops.
+    """
+
+    def __init__(self, dsn: str | None = None, channel: str = CHANNEL):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._listener = PgListener(channel, self._on_notify, dsn=dsn)
+        # Reloads of large messages in flight; the loop only keeps weak references
+        self._reloads: set[asyncio.Task] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        await self._listener.start()
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    async def stop(self) -> None:
+        await self._listener.stop()
+        for task in self._reloads:
+            task.cancel()
+        await asyncio.gather(*self._reloads, return_exceptions=True)
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed event payload")
+            return
+        if not any(uid in self._subscribers for uid in event.get("recipients", {})):
+            return
+        if event.get("type") == "message" and event.get("message") is None:
+            task = asyncio.get_running_loop().create_task(self._dispatch_large(event))
+            self._reloads.add(task)
+            task.add_done_callback(self._reload_done)
+            return
+        self._dispatch(event)
+
+    def _reload_done(self, task: asyncio.Task) -> None:
+        self._reloads.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Could not reload a large message event", exc_info=task.exception())
+
+    async def _dispatch_large(self, event: dict) -> None:
+        async with AsyncSessionLocal() as db:
+            message = await db.get(Message, event["message_id"])
+        if message is None:
+            return
+        event["message"] = MessageResponse.model_validate(message).model_dump(mode="json")
+        self._dispatch(event)
+
+    def _dispatch(self, event: dict) -> None:
+        submission_id = event["submission_id"]
+        for user_id, unread in event.get("recipients", {}).items():
+            for queue in self._subscribers.get(user_id, ()):
+                if event["type"] == "message":
+                    self._offer(queue, ("message", event["message"]))
+                self._offer(
+                    queue,
+                    ("unread", {"submission_id": submission_id, "unread_count": unread}),
+                )
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, item: tuple[str, dict]) -> None:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.warning("Dropping event for a slow stream subscriber")
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+broker = EventBroker()
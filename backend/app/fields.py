@@ -0,0 +1,90 @@
+"""Sparse fieldsets: ?fields=id,title narrows a response to those fields.
+
+Routes validate the list against the response schema (fields_param). CRUD functions
+then select only the matching columns (select_columns) and build the schema with
+model_construct (no validation of the missing fields). sparse_response() serializes
+just the requested fields.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from app.responses import FastJSONResponse
+
+Fields = frozenset[str]
+
+FIELDS_MAX_LENGTH = 500
+
+
+class InvalidFields(ValueError):
+    """fields names nothing, or something that is not in the schema."""
+
+
+def parse_fields(raw: str | None, schema: type[BaseModel]) -> Fields | None:
+    """Comma-separated field names -> set (None when the parameter is absent)."""
+    if raw is None:
+        return None
+    names = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    if not names:
+        raise InvalidFields("fields must name at least one field")
+    unknown = names - schema.model_fields.keys()
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return names
+
+
+def fields_param(schema: type[BaseModel]) -> Callable[..., Fields | None]:
+    """Dependency reading ?fields= and validating it against schema (400 if invalid)."""
+
+    def dependency(
+        fields: str | None = Query(
+            None,
+            max_length=FIELDS_MAX_LENGTH,
+            description=f"Comma-separated {schema.__name__} fields to return (default: all)",
+        ),
+    ) -> Fields | None:
+        try:
+            return parse_fields(fields, schema)
+        except InvalidFields as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    return dependency
+
+
+def select_columns(
+    entity: type, fields: Iterable[str], columns: dict[str, Any] | None = None
+) -> list:
+    """Column expressions for fields, each labelled with the field name, so the result
+    rows read like the schema; fields map to same-named attributes of entity unless
+    columns maps them elsewhere.
+    """
+    columns = columns or {}
+    return [(columns[f] if f in columns else getattr(entity, f)).label(f) for f in fields]
+
+
+def construct(schema: type[BaseModel], row: Any, fields: Iterable[str], **values: Any):
+    """schema.model_construct from row's attributes for fields (values override)."""
+    return schema.model_construct(
+        **{f: values[f] if f in values else getattr(row, f) for f in fields}
+    )
+
+
+def sparse_content(content: Any, fields: Fields) -> Any:
+    """content with only fields, as dicts: a model, a list of models or a page (items).
+    Values stay Python objects (datetimes...); FastJSONResponse encodes them.
+    """
+    if isinstance(content, list):
+        return [item.model_dump(include=set(fields)) for item in content]
+    if "items" in type(content).model_fields:
+        include = {name: True for name in type(content).model_fields if name != "items"}
+        return content.model_dump(include={**include, "items": {"__all__": set(fields)}})
+    return content.model_dump(include=set(fields))
+
+
+def sparse_response(
+    content: Any, fields: Fields, headers: dict[str, str] | None = None
+) -> FastJSONResponse:
+    return FastJSONResponse(sparse_content(content, fields), headers=headers)
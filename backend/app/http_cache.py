@@ -0,0 +1,45 @@
+"""HTTP conditional requests: strong ETags and If-None-Match for public reads.
+
+A route computes its ETag from something cheap (a row's updated_at, the page's ids and
+versions) and answers 304 before building or serializing the full response when the
+client or a proxy in front of the API already holds that version.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+# Bump when the JSON shape of a cached representation changes, so old ETags stop matching
+REPRESENTATION_VERSION = "1"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag (quoted) from the parts that identify one representation."""
+    digest = hashlib.sha256(
+        "\x1f".join([REPRESENTATION_VERSION, *map(str, parts)]).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if If-None-Match lists etag (or is *). Uses the weak comparison RFC 9110
+    requires for If-None-Match, so a proxy's W/ prefix still matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 carrying the validators a 200 would have had."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -1,62 +1,55 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
+from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
-from sqlalchemy import text
 
-from app.config import CORS_ORIGINS, RUN_SEED
-from app.database import AsyncSessionLocal, engine
+from app.auth import PasswordHasherBusy
+from app.cache_invalidation import invalidator
+from app.compression import CompressionMiddleware
+from app.config import (
+    CORS_ORIGINS,
+    EXPOSE_INTERNAL_STATS,
+    EXPOSE_METRICS,
+    MIGRATE_ON_STARTUP,
+    QUERY_STATS_HEADER,
+)
+from app.database import engine, replicas
+from app.events import broker
 from app.limiter import limiter
-from app.models.base import Base
-from app.models.message import Message  # noqa: F401 - register with Base
-from app.models.project import Project  # noqa: F401 - register with Base
-from app.models.submission import Submission  # noqa: F401 - register with Base
-from app.models.user import User  # noqa: F401 - register with Base
-from app.routers import auth, projects, submissions
-from app.seed import seed_if_empty
+from app.migrations import LATEST_VERSION, current_version, migrate
+from app.prometheus import (
+    MetricsMiddleware,
+    rate_limit_exceeded_handler,
+    snapshot_writer,
+)
+from app.query_stats import QueryStatsMiddleware
+from app.routers import auth, internal, metrics, projects, submissions
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables (users first, then projects with user_id FK)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        # Add created_at to existing projects table if missing (migration)
-        await conn.execute(
-            text(
-                "ALTER TABLE projects ADD COLUMN IF NOT EXISTS created_at "
-                "TIMESTAMPTZ NOT NULL DEFAULT now()"
-            )
-        )
-        # Epic 4: one submission per (project, learner) — add unique constraint if missing
-        await conn.execute(
-            text(
-                "DO $$ BEGIN "
-                "IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'submissions') "
-                "AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_submission_project_learner') THEN "
-                "ALTER TABLE submissions ADD CONSTRAINT uq_submission_project_learner "
-                "UNIQUE (project_id, learner_id); "
-                "END IF; END $$"
+    # Schema is versioned (app/migrations.py); when it is current this is a read-only check
+    async with engine.connect() as conn:
+        version = await current_version(conn)
+    if version < LATEST_VERSION:
+        if not MIGRATE_ON_STARTUP:
+            raise RuntimeError(
+                f"Database schema is at version {version}, expected {LATEST_VERSION}: "
+                "run `python -m app.commands.migrate`"
             )
-        )
-        # Unread messages: when learner/owner last opened the thread
-        await conn.execute(
-            text(
-                "ALTER TABLE submissions ADD COLUMN IF NOT EXISTS learner_last_read_at TIMESTAMPTZ"
-            )
-        )
-        await conn.execute(
-            text(
-                "ALTER TABLE submissions ADD COLUMN IF NOT EXISTS owner_last_read_at TIMESTAMPTZ"
-            )
-        )
-    # Seed if empty
-    async with AsyncSessionLocal() as db:
-        await seed_if_empty(db)
+        await migrate(engine)
+    # Hear about project writes from other workers (read caches in app.crud.projects)
+    await invalidator.start()
+    # Share this worker's metrics with the others (METRICS_DIR)
+    await snapshot_writer.start()
     yield
+    await snapshot_writer.stop()
+    await invalidator.stop()
+    await broker.stop()
+    await replicas.dispose()
     await engine.dispose()
 
 
@@ -67,7 +60,19 @@ app = FastAPI(
     lifespan=lifespan,
 )
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed load when the bcrypt pool is saturated instead of queueing without bound."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many authentication requests, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.add_middleware(SlowAPIMiddleware)
 
 app.add_middleware(
@@ -78,9 +83,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+# Route counts and latency around every middleware below
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so the counts cover every middleware and handler below
+app.add_middleware(QueryStatsMiddleware, expose_headers=QUERY_STATS_HEADER)
+
 app.include_router(auth.router)
 app.include_router(projects.router)
 app.include_router(submissions.router)
+if EXPOSE_INTERNAL_STATS:
+    app.include_router(internal.router)
+if EXPOSE_METRICS:
+    app.include_router(metrics.router)
 
 
 @app.get("/health")
@@ -0,0 +1,85 @@
+"""In-process metric primitives (per worker, thread-safe)."""
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+# Latency buckets in seconds (upper bounds), Prometheus-style
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; snapshot() reports cumulative counts like Prometheus."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, n in zip(self.buckets, self._counts):
+                running += n
+                cumulative[str(bound)] = running
+            cumulative["+Inf"] = self._count
+            return {"buckets": cumulative, "sum": self._sum, "count": self._count}
+
+
+class Counter:
+    """Monotonically increasing value (a count, or a total such as seconds)."""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge(Counter):
+    """Value that goes up and down (requests in flight...)."""
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class Family:
+    """One metric per combination of label values (a Histogram per route...), created on
+    first use by factory.
+    """
+
+    def __init__(self, labelnames: tuple[str, ...], factory: Callable[[], Any]):
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def items(self) -> list[tuple[dict[str, str], Any]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [(dict(zip(self.labelnames, values)), child) for values, child in children]
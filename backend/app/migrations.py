@@ -0,0 +1,253 @@
+"""Versioned schema migrations.
+
+Each migration runs once per database; applied versions are recorded in
+schema_migrations. migrate() holds a Postgres advisory lock for the whole run, so when
+several workers or deploy jobs start together only one applies DDL and the others wait,
+then find nothing left to do. Steps stay idempotent (IF NOT EXISTS) because databases
+created before this runner already have part of the schema.
+
+Add a migration by appending to MIGRATIONS with the next version number; never edit or
+reorder one that has shipped.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key, arbitrary but fixed ("toolme" in ASCII)
+MIGRATION_LOCK_KEY = 0x746F6F6C6D65
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+async def _execute_all(conn: AsyncConnection, *statements: str) -> None:
+    for statement in statements:
+        await conn.execute(text(statement))
+
+
+async def _initial_schema(conn: AsyncConnection) -> None:
+    # The schema as the API created it before this runner, spelled out rather than taken
+    # from the models so that this migration never changes
+    await _execute_all(
+        conn,
+        "CREATE TABLE IF NOT EXISTS users ("
+        "id VARCHAR(36) PRIMARY KEY, "
+        "email VARCHAR(255) NOT NULL, "
+        "password_hash VARCHAR(255) NOT NULL, "
+        "created_at TIMESTAMPTZ NOT NULL DEFAULT now())",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)",
+        "CREATE TABLE IF NOT EXISTS projects ("
+        "id VARCHAR(36) PRIMARY KEY, "
+        "title VARCHAR(500) NOT NULL, "
+        "domain VARCHAR(200) NOT NULL, "
+        "short_description TEXT NOT NULL, "
+        "full_description TEXT NOT NULL, "
+        "deadline VARCHAR(50) NOT NULL, "
+        "delivery_instructions TEXT, "
+        "created_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+        "user_id VARCHAR(36) NOT NULL REFERENCES users(id) ON DELETE CASCADE)",
+        "CREATE INDEX IF NOT EXISTS ix_projects_user_id ON projects (user_id)",
+        "CREATE TABLE IF NOT EXISTS submissions ("
+        "id VARCHAR(36) PRIMARY KEY, "
+        "project_id VARCHAR(36) NOT NULL REFERENCES projects(id) ON DELETE CASCADE, "
+        "learner_id VARCHAR(36) NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+        "link VARCHAR(2048), "
+        "file_ref VARCHAR(512), "
+        "created_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+        "coherent BOOLEAN, "
+        "learner_last_read_at TIMESTAMPTZ, "
+        "owner_last_read_at TIMESTAMPTZ, "
+        "CONSTRAINT uq_submission_project_learner UNIQUE (project_id, learner_id))",
+        "CREATE INDEX IF NOT EXISTS ix_submissions_project_id ON submissions (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_submissions_learner_id ON submissions (learner_id)",
+        "CREATE TABLE IF NOT EXISTS messages ("
+        "id VARCHAR(36) PRIMARY KEY, "
+        "submission_id VARCHAR(36) NOT NULL REFERENCES submissions(id) ON DELETE CASCADE, "
+        "sender_id VARCHAR(36) NOT NULL REFERENCES users(id) ON DELETE CASCADE, "
+        "body TEXT NOT NULL, "
+        "created_at TIMESTAMPTZ NOT NULL DEFAULT now())",
+        "CREATE INDEX IF NOT EXISTS ix_messages_submission_id ON messages (submission_id)",
+        "CREATE INDEX IF NOT EXISTS ix_messages_sender_id ON messages (sender_id)",
+        # Tables created by older versions of the API
+        "ALTER TABLE projects ADD COLUMN IF NOT EXISTS created_at "
+        "TIMESTAMPTZ NOT NULL DEFAULT now()",
+        # Epic 4: one submission per (project, learner)
+        "DO $$ BEGIN "
+        "IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_submission_project_learner') THEN "
+        "ALTER TABLE submissions ADD CONSTRAINT uq_submission_project_learner "
+        "UNIQUE (project_id, learner_id); "
+        "END IF; END $$",
+        # Unread messages: when learner/owner last opened the thread
+        "ALTER TABLE submissions ADD COLUMN IF NOT EXISTS learner_last_read_at TIMESTAMPTZ",
+        "ALTER TABLE submissions ADD COLUMN IF NOT EXISTS owner_last_read_at TIMESTAMPTZ",
+    )
+
+
+async def _projects_keyset_index(conn: AsyncConnection) -> None:
+    # Keyset pagination on GET /projects (created_at DESC, id DESC)
+    await _execute_all(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_projects_created_at_id "
+        "ON projects (created_at DESC, id DESC)",
+    )
+
+
+async def _projects_search_vector(conn: AsyncConnection) -> None:
+    # Full-text search: generated tsvector column + GIN index. The expression is
+    # app.models.project.SEARCH_VECTOR_SQL as shipped; changing it takes a new migration.
+    await _execute_all(
+        conn,
+        "ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(domain, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(short_description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(full_description, '')), 'C')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_projects_search_vector "
+        "ON projects USING gin (search_vector)",
+    )
+
+
+async def _thread_counters(conn: AsyncConnection) -> None:
+    # Denormalized thread counters, backfilled from the messages table (the same rules
+    # as app.crud.submissions.recompute_thread_counters, frozen here)
+    await _execute_all(
+        conn,
+        *(
+            f"ALTER TABLE submissions {ddl}"
+            for ddl in (
+                "ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0",
+                "ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMPTZ",
+                "ADD COLUMN IF NOT EXISTS last_message_sender_id VARCHAR(36) "
+                "REFERENCES users(id) ON DELETE SET NULL",
+                "ADD COLUMN IF NOT EXISTS learner_unread_count INTEGER NOT NULL DEFAULT 0",
+                "ADD COLUMN IF NOT EXISTS owner_unread_count INTEGER NOT NULL DEFAULT 0",
+            )
+        ),
+        "UPDATE submissions SET "
+        "message_count = stats.message_count, "
+        "last_message_at = stats.last_message_at, "
+        "last_message_sender_id = stats.last_message_sender_id, "
+        "learner_unread_count = stats.learner_unread_count, "
+        "owner_unread_count = stats.owner_unread_count "
+        "FROM ("
+        "SELECT s.id, "
+        "count(m.id) AS message_count, "
+        "max(m.created_at) AS last_message_at, "
+        "(array_agg(m.sender_id ORDER BY m.created_at DESC, m.id DESC))[1] "
+        "AS last_message_sender_id, "
+        "count(m.id) FILTER (WHERE m.sender_id <> s.learner_id AND "
+        "(s.learner_last_read_at IS NULL OR m.created_at > s.learner_last_read_at)) "
+        "AS learner_unread_count, "
+        "count(m.id) FILTER (WHERE m.sender_id <> p.user_id AND "
+        "(s.owner_last_read_at IS NULL OR m.created_at > s.owner_last_read_at)) "
+        "AS owner_unread_count "
+        "FROM submissions s "
+        "JOIN projects p ON p.id = s.project_id "
+        "LEFT JOIN messages m ON m.submission_id = s.id "
+        "GROUP BY s.id, p.user_id"
+        ") AS stats "
+        "WHERE submissions.id = stats.id",
+    )
+
+
+async def _messages_thread_index(conn: AsyncConnection) -> None:
+    # Cursor-paginated threads (GET /submissions/{id}/messages)
+    await _execute_all(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_messages_submission_created_at_id "
+        "ON messages (submission_id, created_at, id)",
+    )
+
+
+async def _projects_updated_at(conn: AsyncConnection) -> None:
+    # Project version for HTTP ETags; existing rows start at their creation time
+    await _execute_all(
+        conn,
+        "ALTER TABLE projects ADD COLUMN IF NOT EXISTS updated_at "
+        "TIMESTAMPTZ NOT NULL DEFAULT now()",
+        "UPDATE projects SET updated_at = created_at",
+    )
+
+
+async def _projects_change_notify(conn: AsyncConnection) -> None:
+    # Cross-worker project cache invalidation (app/cache_invalidation.py): NOTIFY on commit
+    # for every write, whoever makes it. Inserts only affect list pages (key null). The
+    # channel is app.cache_invalidation.CHANNEL as shipped.
+    await _execute_all(
+        conn,
+        "CREATE OR REPLACE FUNCTION toolme_notify_project_change() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        "IF TG_LEVEL = 'STATEMENT' THEN "
+        "PERFORM pg_notify('toolme_cache', "
+        "json_build_object('cache', 'projects', 'key', NULL)::text); "
+        "ELSE "
+        "PERFORM pg_notify('toolme_cache', "
+        "json_build_object('cache', 'projects', 'key', OLD.id)::text); "
+        "END IF; RETURN NULL; END $$",
+        "DROP TRIGGER IF EXISTS projects_notify_insert ON projects",
+        "CREATE TRIGGER projects_notify_insert AFTER INSERT ON projects "
+        "FOR EACH STATEMENT EXECUTE FUNCTION toolme_notify_project_change()",
+        "DROP TRIGGER IF EXISTS projects_notify_change ON projects",
+        "CREATE TRIGGER projects_notify_change AFTER UPDATE OR DELETE ON projects "
+        "FOR EACH ROW EXECUTE FUNCTION toolme_notify_project_change()",
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial schema", _initial_schema),
+    Migration(2, "projects keyset index", _projects_keyset_index),
+    Migration(3, "projects search vector", _projects_search_vector),
+    Migration(4, "submission thread counters", _thread_counters),
+    Migration(5, "messages thread index", _messages_thread_index),
+    Migration(6, "projects updated_at", _projects_updated_at),
+    Migration(7, "projects change notify trigger", _projects_change_notify),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+async def current_version(conn: AsyncConnection) -> int:
+    """Highest applied version, 0 for a database the runner has never touched."""
+    if await conn.scalar(text("SELECT to_regclass('schema_migrations')")) is None:
+        return 0
+    return await conn.scalar(text("SELECT coalesce(max(version), 0) FROM schema_migrations"))
+
+
+async def migrate(engine: AsyncEngine) -> list[Migration]:
+    """Apply pending migrations in one transaction under the advisory lock.
+
+    Returns the migrations applied by this call (empty if another process did them).
+    """
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        await conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version INTEGER PRIMARY KEY, "
+                "name TEXT NOT NULL, "
+                "applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+        )
+        applied = set((await conn.scalars(text("SELECT version FROM schema_migrations"))).all())
+        pending = [m for m in MIGRATIONS if m.version not in applied]
+        for migration in pending:
+            logger.info("Applying migration %04d %s", migration.version, migration.name)
+            await migration.upgrade(conn)
+            await conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": migration.version, "name": migration.name},
+            )
+    return pending
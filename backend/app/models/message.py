@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -57,3 +57,12 @@ class Message(Base):
         "User",
         foreign_keys=[sender_id],
     )
+
+
+# Thread pages: WHERE submission_id = ? ORDER BY created_at, id (keyset in both directions)
+Index(
+    "ix_messages_submission_created_at_id",
+    Message.submission_id,
+    Message.created_at,
+    Message.id,
+)
@@ -2,7 +2,8 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -16,6 +17,17 @@ def _uuid_str() -> str:
     return str(uuid.uuid4())
 
 
+# Full-text search (GET /projects/search): text search config and weighted document.
+# Title ranks highest, then domain/short description, then the full description.
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(domain, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(short_description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(full_description, '')), 'C')"
+)
+
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -35,16 +47,36 @@ class Project(Base):
         server_default=func.now(),
         nullable=False,
     )
+    # Bumped on every ORM update; the project's ETag (GET /projects, /projects/{id})
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
     user_id: Mapped[str] = mapped_column(
         String(36),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
+    # Maintained by Postgres (generated column); never loaded unless asked for
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_SQL, persisted=True),
+        deferred=True,
+    )
 
     owner: Mapped["User"] = relationship("User", back_populates="projects")
     submissions: Mapped[list["Submission"]] = relationship(
         "Submission",
         back_populates="project",
         cascade="all, delete-orphan",
+        # FKs are ON DELETE CASCADE: let Postgres delete children instead of loading them
+        passive_deletes=True,
     )
+
+
+# Keyset pagination on the home page: ORDER BY created_at DESC, id DESC
+Index("ix_projects_created_at_id", Project.created_at.desc(), Project.id.desc())
+Index("ix_projects_search_vector", Project.search_vector, postgresql_using="gin")
@@ -31,9 +31,12 @@ class User(Base):
         "Project",
         back_populates="owner",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     submissions_as_learner: Mapped[list["Submission"]] = relationship(
         "Submission",
         back_populates="learner",
+        foreign_keys="Submission.learner_id",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
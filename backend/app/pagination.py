@@ -0,0 +1,26 @@
+"""Opaque keyset cursors: (created_at, id) encoded as URL-safe base64."""
+
+import base64
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    """Cursor token could not be decoded (tampered, truncated or from another endpoint)."""
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = f"{created_at.isoformat()},{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, str]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_raw, row_id = raw.split(",", 1)
+        created_at = datetime.fromisoformat(created_raw)
+    except (ValueError, UnicodeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not row_id or created_at.tzinfo is None:
+        raise InvalidCursor("Invalid cursor")
+    return created_at, row_id
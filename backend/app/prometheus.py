@@ -0,0 +1,343 @@
+"""Prometheus text exposition for GET /metrics.
+
+Per route (the path template, e.g. /projects/{project_id}): requests by status and
+latency histograms; requests in flight per method, since the route is only known once
+the router has run (MetricsMiddleware; an SSE stream counts until it closes). Also SQL
+statements and their durations (app.query_stats), the primary connection pool,
+rate-limit rejections and the bcrypt pool (app.auth.password_hasher).
+
+Several workers (uvicorn --workers): set METRICS_DIR to a directory shared by the
+workers of one server, emptied before they start. Each worker writes its samples to
+<pid>.json every METRICS_WRITE_INTERVAL seconds and on shutdown; the worker answering a
+scrape merges those files with its own live samples. Counters and histograms are summed
+over every file, exited workers included, so totals never go backwards; gauges only over
+workers still running.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from fastapi import Request
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth import password_hasher
+from app.config import METRICS_DIR, METRICS_WRITE_INTERVAL
+from app.database import pool_stats
+from app.metrics import Counter, Family, Gauge, Histogram
+from app.query_stats import db_query_duration
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for paths no route matches (404s), so scans cannot blow up the label set
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_requests = Family(("method", "route", "status"), Counter)
+http_request_duration = Family(("method", "route"), Histogram)
+http_in_flight = Family(("method",), Gauge)
+rate_limit_rejections = Family(("route",), Counter)
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled scope (the router stores it in the
+    shared scope), UNMATCHED_ROUTE if none did.
+    """
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: count, time and track in-flight HTTP requests per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        in_flight = http_in_flight.labels(method)
+        # Unless a response starts, the server answers 500
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = route_template(scope)
+            http_request_duration.labels(method, route).observe(time.perf_counter() - start)
+            http_requests.labels(method, route, str(status)).inc()
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """SlowAPI's 429 handler, counting the rejection."""
+    rate_limit_rejections.labels(route_template(request.scope)).inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+def _metric(name: str, kind: str, help_text: str, samples: list) -> dict:
+    # samples: [labels, value] pairs; a histogram's value is its snapshot()
+    return {"name": name, "type": kind, "help": help_text, "samples": samples}
+
+
+def collect() -> list[dict]:
+    """This worker's metrics (JSON-serializable)."""
+    pool = pool_stats()
+    hasher = password_hasher.stats()
+    return [
+        _metric(
+            "toolme_http_requests_total",
+            "counter",
+            "HTTP requests handled, by route template and status.",
+            [[labels, c.value] for labels, c in http_requests.items()],
+        ),
+        _metric(
+            "toolme_http_request_duration_seconds",
+            "histogram",
+            "HTTP request latency, until the response is fully sent.",
+            [[labels, h.snapshot()] for labels, h in http_request_duration.items()],
+        ),
+        _metric(
+            "toolme_http_requests_in_flight",
+            "gauge",
+            "HTTP requests (and open streams) being handled, by method.",
+            [[labels, g.value] for labels, g in http_in_flight.items()],
+        ),
+        _metric(
+            "toolme_rate_limit_rejections_total",
+            "counter",
+            "Requests refused with 429 by the rate limiter.",
+            [[labels, c.value] for labels, c in rate_limit_rejections.items()],
+        ),
+        _metric(
+            "toolme_db_query_duration_seconds",
+            "histogram",
+            "SQL statement execution time (all engines); _count is the number of queries.",
+            [[{}, db_query_duration.snapshot()]],
+        ),
+        _metric(
+            "toolme_db_pool_connections",
+            "gauge",
+            "Primary pool connections by state.",
+            [
+                [{"state": "checked_out"}, pool["checked_out"]],
+                [{"state": "idle"}, pool["idle"]],
+                [{"state": "overflow"}, pool["overflow"]],
+            ],
+        ),
+        _metric(
+            "toolme_db_pool_size",
+            "gauge",
+            "Configured primary pool size (before overflow).",
+            [[{}, pool["size"]]],
+        ),
+        _metric(
+            "toolme_db_pool_checkout_timeouts_total",
+            "counter",
+            "Pool checkouts that gave up after DB_POOL_TIMEOUT.",
+            [[{}, pool["checkout_timeouts"]]],
+        ),
+        _metric(
+            "toolme_db_pool_checkout_wait_seconds",
+            "histogram",
+            "Time spent obtaining a pool connection.",
+            [[{}, pool["checkout_wait_seconds"]]],
+        ),
+        _metric(
+            "toolme_password_hash_running",
+            "gauge",
+            "bcrypt jobs running on the hasher pool.",
+            [[{}, hasher["running"]]],
+        ),
+        _metric(
+            "toolme_password_hash_queued",
+            "gauge",
+            "bcrypt jobs waiting for a hasher thread.",
+            [[{}, hasher["queued"]]],
+        ),
+        _metric(
+            "toolme_password_hash_completed_total",
+            "counter",
+            "bcrypt jobs completed.",
+            [[{}, hasher["completed"]]],
+        ),
+        _metric(
+            "toolme_password_hash_cancelled_total",
+            "counter",
+            "Queued bcrypt jobs dropped because their request went away.",
+            [[{}, hasher["cancelled"]]],
+        ),
+        _metric(
+            "toolme_password_hash_rejected_total",
+            "counter",
+            "bcrypt jobs refused with 503 because the queue was full.",
+            [[{}, hasher["rejected"]]],
+        ),
+    ]
+
+
+def _snapshot_path(directory: str, pid: int) -> Path:
+    return Path(directory) / f"{pid}.json"
+
+
+def write_snapshot(directory: str) -> None:
+    """Replace this worker's file in directory with its current samples."""
+    path = _snapshot_path(directory, os.getpid())
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(collect()))
+    os.replace(tmp, path)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_snapshots(directory: str | None = METRICS_DIR) -> list[tuple[bool, list[dict]]]:
+    """(worker alive, metrics) for this worker and, with a directory, every other
+    worker's last written file.
+    """
+    snapshots = [(True, collect())]
+    if not directory:
+        return snapshots
+    own = os.getpid()
+    for path in Path(directory).glob("*.json"):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if pid == own:
+            continue
+        try:
+            metrics = json.loads(path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable metrics file %s", path)
+            continue
+        snapshots.append((_alive(pid), metrics))
+    return snapshots
+
+
+def _add(a, b):
+    if isinstance(a, dict):
+        return {
+            "buckets": {le: n + b["buckets"].get(le, 0) for le, n in a["buckets"].items()},
+            "sum": a["sum"] + b["sum"],
+            "count": a["count"] + b["count"],
+        }
+    return a + b
+
+
+def merge(snapshots: list[tuple[bool, list[dict]]]) -> list[dict]:
+    """Sum samples with the same name and labels; gauges only from live workers."""
+    merged: dict[str, dict] = {}
+    for alive, metrics in snapshots:
+        for metric in metrics:
+            target = merged.setdefault(metric["name"], {**metric, "samples": {}})
+            if metric["type"] == "gauge" and not alive:
+                continue
+            for labels, value in metric["samples"]:
+                key = tuple(sorted(labels.items()))
+                current = target["samples"].get(key)
+                target["samples"][key] = value if current is None else _add(current, value)
+    return [
+        {**metric, "samples": [[dict(key), value] for key, value in metric["samples"].items()]}
+        for metric in merged.values()
+    ]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def render(metrics: list[dict]) -> str:
+    """Text exposition format 0.0.4."""
+    lines = []
+    for metric in metrics:
+        name = metric["name"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for labels, value in metric["samples"]:
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(labels)} {float(value)!r}")
+                continue
+            for le, n in value["buckets"].items():
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {float(n)!r}")
+            lines.append(f"{name}_sum{_labels(labels)} {float(value['sum'])!r}")
+            lines.append(f"{name}_count{_labels(labels)} {float(value['count'])!r}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_text() -> str:
+    """What GET /metrics returns: all workers' metrics when METRICS_DIR is set."""
+    return render(merge(read_snapshots()))
+
+
+class SnapshotWriter:
+    """Writes this worker's samples to METRICS_DIR every interval and on stop (nothing
+    to do without a directory).
+    """
+
+    def __init__(
+        self, directory: str | None = METRICS_DIR, interval: float = METRICS_WRITE_INTERVAL
+    ):
+        self.directory = directory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if not self.directory:
+            return
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        self._write()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._write()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_snapshot(self.directory)
+        except OSError:
+            logger.exception("Could not write metrics to %s", self.directory)
+
+
+snapshot_writer = SnapshotWriter()
@@ -0,0 +1,119 @@
+"""Per-request SQL query counting, fed by SQLAlchemy engine events.
+
+QueryStatsMiddleware opens a QueryStats for each HTTP request (a contextvar, so handlers
+can read it with current_query_stats()) and, when QUERY_STATS_HEADER is on, reports it
+as X-DB-Queries and Server-Timing headers. record_queries() captures every query from
+any thread or request, which the tests use to enforce query budgets. Every query is also
+observed in db_query_duration (this worker's total, exported on /metrics).
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import Histogram
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    # Only filled by record_queries (kept out of per-request stats to stay cheap)
+    statements: list[str] | None = None
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+db_query_duration = Histogram()
+
+_request_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+_recorders: list[QueryStats] = []
+_recorders_lock = threading.Lock()
+
+
+def current_query_stats() -> QueryStats | None:
+    """Queries run so far by the current request (None outside a request)."""
+    return _request_stats.get()
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """Collect every query executed (any engine, any thread) until the block exits."""
+    stats = QueryStats(statements=[])
+    with _recorders_lock:
+        _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        with _recorders_lock:
+            _recorders.remove(stats)
+
+
+# Registered on the Engine class so the primary, replicas and ad-hoc engines all report.
+# AsyncSession runs these in a greenlet that shares the request's contextvars.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    db_query_duration.observe(duration)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add(statement, duration)
+    if _recorders:
+        with _recorders_lock:
+            for recorder in _recorders:
+                recorder.add(statement, duration)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # after_cursor_execute does not run for a failed statement
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware: one QueryStats per HTTP request, optional response headers.
+
+    Headers are written when the response starts, so queries run after that (streamed
+    bodies, dependency teardown) are not in them.
+    """
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = False):
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.count))
+                headers.append("Server-Timing", f"db;dur={stats.duration * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _request_stats.reset(token)
@@ -0,0 +1,21 @@
+"""Response classes for routes that build their JSON body themselves.
+
+Routes returning a model with a response_model already get pydantic-core's serializer
+from FastAPI. A route returning a JSONResponse directly (sparse fieldsets, for one) goes
+through json.dumps instead, after jsonable_encoder has walked the content in Python;
+FastJSONResponse hands the content to pydantic-core's Rust encoder in one call.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by pydantic_core.to_json: models, dicts, lists, datetimes and
+    UUIDs are serialized natively (datetimes as ISO 8601, like FastAPI's encoder).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
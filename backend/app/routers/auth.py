@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import create_access_token, verify_password
+from app.auth import create_access_token, verify_password_async
 from app.config import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     AUTH_COOKIE_HTTPONLY,
@@ -40,13 +40,12 @@ async def signup(
             detail="Password must be at least 12 characters",
         )
 
-    existing = await get_user_by_email(db, payload.email)
-    if existing:
+    user_response = await create_user(db, payload)
+    if user_response is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    user_response = await create_user(db, payload)
     return user_response
 
 
@@ -59,7 +58,7 @@ async def login(
 ):
     """Log in with email and password. Returns JWT and sets HTTP-only cookie (E-2)."""
     user = await get_user_by_email(db, payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -0,0 +1,27 @@
+"""Internal runtime stats (not for public exposure; disabled in production by default)."""
+
+from fastapi import APIRouter
+
+from app.auth import password_hasher, token_cache
+from app.cache_invalidation import invalidator
+from app.compression import ENCODERS, compressed_cache
+from app.crud.projects import project_cache, project_list_cache
+from app.crud.users import user_cache
+from app.database import pool_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/stats")
+def read_stats():
+    """Live counters of in-process executors, caches and the DB pool (this worker)."""
+    return {
+        "password_hasher": password_hasher.stats(),
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "project_cache": project_cache.stats(),
+        "project_list_cache": project_list_cache.stats(),
+        "cache_invalidation": invalidator.stats(),
+        "compression": {"encodings": list(ENCODERS), "cache": compressed_cache.stats()},
+        "db_pool": pool_stats(),
+    }
@@ -0,0 +1,16 @@
+"""Prometheus scrape endpoint (see app.prometheus)."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.prometheus import CONTENT_TYPE, metrics_text
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """Text exposition format, merged across workers when METRICS_DIR is set.
+    Sync on purpose: reading the workers' files runs in the threadpool.
+    """
+    return PlainTextResponse(metrics_text(), media_type=CONTENT_TYPE)
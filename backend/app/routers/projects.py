@@ -1,52 +1,184 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import PROJECT_LIST_MAX_AGE, PROJECT_LIST_STALE_WHILE_REVALIDATE
 from app.crud.projects import create_project as crud_create_project
 from app.crud.projects import delete_project as crud_delete_project
-from app.crud.projects import get_project as crud_get_project
-from app.crud.projects import list_projects as crud_list_projects
+from app.crud.projects import get_project_cached as crud_get_project_cached
+from app.crud.projects import get_project_version as crud_get_project_version
+from app.crud.projects import is_project_owner as crud_is_project_owner
 from app.crud.projects import list_projects_by_owner as crud_list_projects_by_owner
+from app.crud.projects import list_projects_cached as crud_list_projects_cached
+from app.crud.projects import purge_project as crud_purge_project
+from app.crud.projects import search_projects as crud_search_projects
 from app.crud.projects import update_project as crud_update_project
 from app.crud.submissions import (
-    create_submission as crud_create_submission,
+    DuplicateSubmission,
+)
+from app.crud.submissions import create_submission as crud_create_submission
+from app.crud.submissions import (
     get_submission_by_project_and_learner as crud_get_submission_by_project_and_learner,
+)
+from app.crud.submissions import (
     list_submissions_by_project as crud_list_submissions_by_project,
 )
-from sqlalchemy.exc import IntegrityError
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_user
+from app.fields import Fields, fields_param, sparse_response
+from app.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
 from app.models.user import User
-from app.schemas.project import ProjectCreate, ProjectListResponse, ProjectResponse, ProjectUpdate
+from app.pagination import InvalidCursor
+from app.schemas.project import (
+    ProjectCreate,
+    ProjectListResponse,
+    ProjectResponse,
+    ProjectSummary,
+    ProjectSummaryListResponse,
+    ProjectUpdate,
+)
 from app.schemas.submission import SubmissionCreate, SubmissionResponse
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Shared caches may serve the list briefly; a single project is revalidated every time
+LIST_CACHE_CONTROL = (
+    f"public, max-age={PROJECT_LIST_MAX_AGE}, "
+    f"stale-while-revalidate={PROJECT_LIST_STALE_WHILE_REVALIDATE}"
+)
+PROJECT_CACHE_CONTROL = "public, no-cache"
+
+
+# view=summary: card fields only (no full_description / delivery_instructions)
+ListView = Literal["full", "summary"]
+
 
-@router.get("", response_model=ProjectListResponse)
+def _fields_tag(fields: Fields | None) -> str:
+    return ",".join(sorted(fields)) if fields is not None else "*"
+
+
+def _list_etag(
+    page: ProjectListResponse | ProjectSummaryListResponse, view: ListView, fields: Fields | None
+) -> str:
+    return make_etag(
+        view,
+        _fields_tag(fields),
+        page.total,
+        page.next_cursor,
+        *(f"{p.id}@{p.updated_at.isoformat()}" for p in page.items),
+    )
+
+
+@router.get("", response_model=ProjectListResponse | ProjectSummaryListResponse)
 async def read_projects(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None, max_length=200),
+    include_total: bool | None = Query(None),
+    view: ListView = Query("full"),
+    fields: Fields | None = Depends(fields_param(ProjectResponse)),
 ):
-    """List projects with pagination (public discovery)."""
-    return await crud_list_projects(db, skip=skip, limit=limit)
+    """List projects with pagination (public discovery).
 
+    Pass the previous page's next_cursor as after for keyset pagination (skip is then
+    ignored and total is omitted unless include_total=true). skip/limit still works.
+    view=summary returns ProjectSummary items (for cards), reading only those columns;
+    fields=id,title,... returns (and reads) just those fields and overrides view.
 
-@router.get("/me", response_model=list[ProjectResponse])
+    Sends an ETag (from the page's project ids and versions) and a public Cache-Control;
+    If-None-Match with the current ETag gets 304 without serializing the page.
+    """
+    try:
+        page = await crud_list_projects_cached(
+            db,
+            skip=skip,
+            limit=limit,
+            after=after,
+            include_total=include_total,
+            summary=view == "summary",
+            fields=fields,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    etag = _list_etag(page, view, fields)
+    if etag_matches(request, etag):
+        return not_modified(etag, LIST_CACHE_CONTROL)
+    if fields is not None:
+        return sparse_response(page, fields, {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL})
+    set_cache_headers(response, etag, LIST_CACHE_CONTROL)
+    return page
+
+
+@router.get("/me", response_model=list[ProjectResponse] | list[ProjectSummary])
 async def read_my_projects(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
+    view: ListView = Query("full"),
+    fields: Fields | None = Depends(fields_param(ProjectResponse)),
 ):
-    """List projects owned by the current user."""
-    return await crud_list_projects_by_owner(db, current_user.id)
+    """List projects owned by the current user (view=summary: card fields only,
+    fields=...: just those fields).
+    """
+    projects = await crud_list_projects_by_owner(
+        db, current_user.id, summary=view == "summary", fields=fields
+    )
+    if fields is not None:
+        return sparse_response(projects, fields)
+    return projects
+
+
+@router.get("/search", response_model=ProjectListResponse)
+async def search_projects(
+    db: AsyncSession = Depends(get_read_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Full-text search over all projects, ranked by relevance (public discovery)."""
+    return await crud_search_projects(db, q, skip=skip, limit=limit)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def read_project(project_id: str, db: AsyncSession = Depends(get_db)):
-    """Get a project by id (public)."""
-    project = await crud_get_project(db, project_id)
+async def read_project(
+    project_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    fields: Fields | None = Depends(fields_param(ProjectResponse)),
+):
+    """Get a project by id (public); fields=id,title,... returns just those fields.
+
+    The ETag follows the project's updated_at. A request with If-None-Match only reads
+    that column and gets 304 if it still matches.
+    """
+    if request.headers.get("if-none-match"):
+        version = await crud_get_project_version(db, project_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        etag = make_etag(project_id, version.isoformat(), _fields_tag(fields))
+        if etag_matches(request, etag):
+            return not_modified(etag, PROJECT_CACHE_CONTROL)
+    project = await crud_get_project_cached(db, project_id, fields=fields)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    etag = make_etag(project.id, project.updated_at.isoformat(), _fields_tag(fields))
+    if fields is not None:
+        return sparse_response(
+            project, fields, {"ETag": etag, "Cache-Control": PROJECT_CACHE_CONTROL}
+        )
+    set_cache_headers(response, etag, PROJECT_CACHE_CONTROL)
     return project
 
 
@@ -74,13 +206,28 @@ async def update_project_item(
     return project
 
 
-@router.delete("/{project_id}", status_code=204)
+@router.delete(
+    "/{project_id}",
+    status_code=204,
+    responses={202: {"description": "background=true: deletion scheduled"}},
+)
 async def delete_project_item(
     project_id: str,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    background: bool = Query(False),
 ):
-    """Delete a project. Only the owner can delete."""
+    """Delete a project with its submissions and messages. Only the owner can delete.
+
+    background=true (for very large projects) answers 202 at once and deletes in batches
+    after the response; the project stays visible until the purge finishes.
+    """
+    if background:
+        if not await crud_is_project_owner(db, project_id, current_user.id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        background_tasks.add_task(crud_purge_project, project_id)
+        return Response(status_code=202)
     if not await crud_delete_project(db, project_id, current_user.id):
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -93,20 +240,12 @@ async def create_project_submission(
     current_user: User = Depends(get_current_user),
 ):
     """Submit a solution to a project (learner). One submission per project max; use the thread to send updates."""
-    existing = await crud_get_submission_by_project_and_learner(
-        db, project_id, current_user.id
-    )
-    if existing:
-        raise HTTPException(
-            status_code=409,
-            detail="You already have a submission for this project. Use the message thread to send corrections or updates (it still counts as one submission).",
-        )
     try:
         result = await crud_create_submission(db, project_id, current_user.id, payload)
-    except IntegrityError:
+    except DuplicateSubmission:
         raise HTTPException(
             status_code=409,
-            detail="You already have a submission for this project. Use the message thread to send corrections or updates.",
+            detail="You already have a submission for this project. Use the message thread to send corrections or updates (it still counts as one submission).",
         )
     if not result:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -116,11 +255,11 @@ async def create_project_submission(
 @router.get("/{project_id}/my-submission", response_model=SubmissionResponse)
 async def read_my_submission_for_project(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get the current user's submission for this project, if any (for apply page: already submitted?)."""
-    proj = await crud_get_project(db, project_id)
+    proj = await crud_get_project_cached(db, project_id)
     if not proj:
         raise HTTPException(status_code=404, detail="Project not found")
     submission = await crud_get_submission_by_project_and_learner(
@@ -134,11 +273,19 @@ async def read_my_submission_for_project(
 @router.get("/{project_id}/submissions", response_model=list[SubmissionResponse])
 async def read_project_submissions(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
+    fields: Fields | None = Depends(fields_param(SubmissionResponse)),
 ):
-    """List submissions for a project. Only the project owner can list."""
-    proj = await crud_get_project(db, project_id)
+    """List submissions for a project. Only the project owner can list.
+    fields=id,link,... returns just those fields.
+    """
+    proj = await crud_get_project_cached(db, project_id)
     if not proj or proj.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Project not found")
-    return await crud_list_submissions_by_project(db, project_id, current_user.id)
+    submissions = await crud_list_submissions_by_project(
+        db, project_id, current_user.id, fields=fields
+    )
+    if fields is not None:
+        return sparse_response(submissions, fields)
+    return submissions
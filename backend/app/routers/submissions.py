@@ -1,19 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.projects import get_project
 from app.crud.submissions import (
+    SubmissionAccess,
     add_message,
     get_submission_with_messages,
+    list_messages,
     list_submissions_by_learner,
     mark_submission_read,
     update_submission_coherent,
 )
-from app.database import get_db
-from app.dependencies import get_current_user
+from app.database import get_db, get_read_db
+from app.dependencies import (
+    get_current_user,
+    get_submission_access,
+    get_submission_read_access,
+)
+from app.events import broker, format_sse
+from app.fields import Fields, fields_param, sparse_response
 from app.models.user import User
+from app.pagination import InvalidCursor
 from app.schemas.submission import (
     MessageCreate,
+    MessagePageResponse,
     MessageResponse,
     SubmissionCreate,
     SubmissionCoherentUpdate,
@@ -23,35 +35,94 @@ from app.schemas.submission import (
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
 
+# Comment line sent when idle so proxies keep the stream open
+STREAM_HEARTBEAT_SECONDS = 15
+
 
 @router.get("/me", response_model=list[SubmissionResponse])
 async def read_my_submissions(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
+    fields: Fields | None = Depends(fields_param(SubmissionResponse)),
 ):
-    """List submissions by the current user (learner)."""
-    return await list_submissions_by_learner(db, current_user.id)
+    """List submissions by the current user (learner); fields=id,link,... returns just
+    those fields.
+    """
+    submissions = await list_submissions_by_learner(db, current_user.id, fields=fields)
+    if fields is not None:
+        return sparse_response(submissions, fields)
+    return submissions
+
+
+@router.get("/stream")
+async def stream_thread_events(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """Server-sent events for the current user's threads (as learner or owner).
+
+    event: message  data: MessageResponse of a new message
+    event: unread   data: {"submission_id", "unread_count"} after a post or mark-read
+    Events sent while disconnected are not replayed: catch up with GET /{id}/messages?after=.
+    """
+    user_id = current_user.id
+
+    async def events():
+        queue = await broker.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(event, data)
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{submission_id}", response_model=SubmissionWithMessagesResponse)
 async def read_submission(
     submission_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    access: SubmissionAccess = Depends(get_submission_read_access),
+    messages_limit: int | None = Query(None, ge=1, le=200),
 ):
-    """Get one submission with message thread. Allowed for learner or project owner."""
-    from app.models.project import Project
-    from app.models.submission import Submission
+    """Get one submission with message thread. Allowed for learner or project owner.
+    With messages_limit, only the last N messages are embedded (see /messages for older ones).
+    """
+    return await get_submission_with_messages(
+        db, submission_id, messages_limit=messages_limit, access=access
+    )
 
-    s = await db.get(Submission, submission_id)
-    if not s:
-        raise HTTPException(status_code=404, detail="Submission not found")
-    project = await db.get(Project, s.project_id)
-    if current_user.id != s.learner_id and (not project or project.user_id != current_user.id):
-        raise HTTPException(status_code=403, detail="Not allowed to view this submission")
-    sub = await get_submission_with_messages(db, submission_id)
-    assert sub is not None
-    return sub
+
+@router.get("/{submission_id}/messages", response_model=MessagePageResponse)
+async def read_submission_messages(
+    submission_id: str,
+    db: AsyncSession = Depends(get_read_db),
+    access: SubmissionAccess = Depends(get_submission_read_access),
+    before: str | None = Query(None, max_length=200),
+    after: str | None = Query(None, max_length=200),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Page through the message thread (oldest first). Allowed for learner or project owner.
+    No cursor returns the latest messages; before= loads older ones, after= newer ones.
+    """
+    try:
+        return await list_messages(db, submission_id, before=before, after=after, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @router.post("/{submission_id}/read", status_code=204)
@@ -59,18 +130,10 @@ async def read_submission_mark_read(
     submission_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    access: SubmissionAccess = Depends(get_submission_access),
 ):
     """Mark the thread as read for the current user (learner or owner). Call when opening the thread."""
-    from app.models.project import Project
-    from app.models.submission import Submission
-
-    s = await db.get(Submission, submission_id)
-    if not s:
-        raise HTTPException(status_code=404, detail="Submission not found")
-    project = await db.get(Project, s.project_id)
-    if current_user.id != s.learner_id and (not project or project.user_id != current_user.id):
-        raise HTTPException(status_code=403, detail="Not allowed")
-    await mark_submission_read(db, submission_id, current_user.id)
+    await mark_submission_read(db, submission_id, current_user.id, access=access)
 
 
 @router.patch("/{submission_id}/coherent", response_model=SubmissionResponse)
@@ -93,19 +156,9 @@ async def create_message(
     payload: MessageCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    access: SubmissionAccess = Depends(get_submission_access),
 ):
     """Add a message to the submission thread. Allowed for learner or project owner."""
-    from app.models.project import Project
-    from app.models.submission import Submission
-
-    s = await db.get(Submission, submission_id)
-    if not s:
-        raise HTTPException(status_code=404, detail="Submission not found")
-    project = await db.get(Project, s.project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    if current_user.id != s.learner_id and project.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to post in this thread")
-    msg = await add_message(db, submission_id, current_user.id, payload)
+    msg = await add_message(db, submission_id, current_user.id, payload, access=access)
     assert msg is not None
     return msg
@@ -1,7 +1,8 @@
 from app.schemas.project import (
     ProjectCreate,
     ProjectResponse,
+    ProjectSummary,
     ProjectUpdate,
 )
 
-__all__ = ["ProjectCreate", "ProjectUpdate", "ProjectResponse"]
+__all__ = ["ProjectCreate", "ProjectUpdate", "ProjectResponse", "ProjectSummary"]
@@ -35,12 +35,41 @@ class ProjectResponse(ProjectBase):
     id: str
     user_id: str  # owner, for "my ad" and edit/delete
     created_at: datetime  # serialized as ISO string in JSON
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ProjectSummary(BaseModel):
+    """Card fields only (view=summary): no full_description or delivery_instructions."""
+
+    id: str
+    title: str
+    domain: str
+    short_description: str
+    deadline: str
+    user_id: str
+    created_at: datetime
+    updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
 class ProjectListResponse(BaseModel):
-    """Paginated list of projects (home page)."""
+    """Paginated list of projects (home page).
+
+    total is None in cursor mode unless include_total was requested.
+    next_cursor is None on the last page.
+    """
 
     items: list[ProjectResponse]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
+
+
+class ProjectSummaryListResponse(BaseModel):
+    """ProjectListResponse with ProjectSummary items (view=summary)."""
+
+    items: list[ProjectSummary]
+    total: int | None
+    next_cursor: str | None = None
@@ -54,14 +54,32 @@ class SubmissionResponse(BaseModel):
     coherent: bool | None
     message_count: int = 0
     unread_count: int = 0  # For current viewer (learner or owner)
+    last_message_at: datetime | None = None
+    last_message_sender_id: str | None = None
 
     model_config = {"from_attributes": True}
 
 
 class SubmissionWithMessagesResponse(SubmissionResponse):
-    """Submission with full message thread."""
+    """Submission with its message thread (full, or only the last N messages)."""
 
     messages: list[MessageResponse] = []
+    # Set when older messages were left out: pass as before= to GET /submissions/{id}/messages
+    messages_before_cursor: str | None = None
+
+
+class MessagePageResponse(BaseModel):
+    """One page of a thread, oldest first.
+
+    before_cursor loads older messages (before=), after_cursor newer ones (after=, also
+    for polling). has_older / has_newer say whether such messages exist right now.
+    """
+
+    items: list[MessageResponse]
+    before_cursor: str | None = None
+    after_cursor: str | None = None
+    has_older: bool = False
+    has_newer: bool = False
 
 
 class SubmissionCoherentUpdate(BaseModel):
@@ -1,9 +1,17 @@
-"""Seed default projects if the table is empty (M-3: password from SEED_PASSWORD)."""
+"""Seed data: default projects (M-3: password from SEED_PASSWORD) and synthetic load-test
+datasets. Run through app.commands.seed, never at API startup.
+"""
 
-from sqlalchemy import select
+import random
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import hash_password
+from app.auth import hash_password_async
 from app.config import SEED_PASSWORD
 from app.models.project import Project
 from app.models.user import User
@@ -41,27 +49,175 @@ SEED_PROJECTS = [
 ]
 
 
-async def _get_or_create_seed_user(db: AsyncSession) -> User:
-    result = await db.execute(select(User).where(User.email == SEED_USER_EMAIL))
-    user = result.scalar_one_or_none()
-    if user is not None:
-        return user
-    user = User(
-        email=SEED_USER_EMAIL,
-        password_hash=hash_password(SEED_PASSWORD),
+_SYNTHETIC_DOMAINS = ["Documentation", "Web app", "Tooling", "Data", "Design", "Mobile"]
+
+
+async def _seed_user_id(db: AsyncSession) -> str:
+    user_id = await db.scalar(select(User.id).where(User.email == SEED_USER_EMAIL))
+    if user_id is not None:
+        return user_id
+    # Only hash when the user is really missing (bcrypt is deliberately slow)
+    password_hash = await hash_password_async(SEED_PASSWORD)
+    await db.execute(
+        insert(User)
+        .values(id=str(uuid.uuid4()), email=SEED_USER_EMAIL, password_hash=password_hash)
+        .on_conflict_do_nothing(index_elements=[User.email])
+    )
+    return await db.scalar(select(User.id).where(User.email == SEED_USER_EMAIL))
+
+
+async def seed_defaults(db: AsyncSession) -> int:
+    """Insert the seed user and SEED_PROJECTS, skipping rows that exist. Returns projects added."""
+    user_id = await _seed_user_id(db)
+    result = await db.execute(
+        insert(Project)
+        .values([{**data, "user_id": user_id} for data in SEED_PROJECTS])
+        .on_conflict_do_nothing(index_elements=[Project.id])
+        .returning(Project.id)
     )
-    db.add(user)
-    await db.flush()
-    return user
-
-
-async def seed_if_empty(db: AsyncSession) -> None:
-    result = await db.execute(select(Project).limit(1))
-    if result.scalar_one_or_none() is not None:
-        return
-    seed_user = await _get_or_create_seed_user(db)
-    for data in SEED_PROJECTS:
-        project = Project(**data, user_id=seed_user.id)
-        db.add(project)
-    await db.flush()
+    added = len(result.all())
+    await db.commit()
+    return added
+
+
+async def _copy(db: AsyncSession, table: str, columns: list[str], rows: Iterable[tuple]) -> None:
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, records=rows, columns=columns)
+
+
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    batch: list[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def seed_synthetic(
+    db: AsyncSession,
+    users: int,
+    projects: int,
+    submissions: int,
+    messages: int,
+    batch_size: int = 10_000,
+    random_seed: int = 0,
+) -> dict[str, int]:
+    """Bulk-load a synthetic dataset with COPY, in one transaction.
+
+    All users share SEED_PASSWORD (hashed once) and emails synthetic-<run>-<n>@example.com,
+    so runs can be repeated. Submissions take distinct (project, learner) pairs and are
+    capped at projects * users; messages are spread over submissions, alternating sender.
+    Thread counters are rebuilt at the end.
+    """
+    from app.crud.submissions import recompute_thread_counters
+
+    rng = random.Random(random_seed)
+    run = uuid.uuid4().hex[:8]
+    now = datetime.now(timezone.utc)
+    submissions = min(submissions, projects * users)
+    # Loading many rows: losing the tail on a crash is fine for test data
+    await db.execute(text("SET LOCAL synchronous_commit = off"))
+
+    password_hash = await hash_password_async(SEED_PASSWORD)
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    for batch in _batched(
+        (
+            (uid, f"synthetic-{run}-{n}@example.com", password_hash, now - timedelta(days=400))
+            for n, uid in enumerate(user_ids)
+        ),
+        batch_size,
+    ):
+        await _copy(db, "users", ["id", "email", "password_hash", "created_at"], batch)
+
+    project_rows = []
+    for _ in range(projects):
+        project_rows.append(
+            (
+                str(uuid.uuid4()),
+                rng.choice(user_ids),
+                now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            )
+        )
+    for batch in _batched(
+        (
+            (
+                pid,
+                f"Synthetic project {n} ({run})",
+                rng.choice(_SYNTHETIC_DOMAINS),
+                f"Short description for synthetic project {n}.",
+                f"Full description of synthetic project {n}, generated for load tests. "
+                f"Topic: {rng.choice(_SYNTHETIC_DOMAINS).lower()}.",
+                "2030-12-31",
+                "Share a link to your work.",
+                created_at,
+                created_at,
+                owner_id,
+            )
+            for n, (pid, owner_id, created_at) in enumerate(project_rows)
+        ),
+        batch_size,
+    ):
+        await _copy(
+            db,
+            "projects",
+            [
+                "id",
+                "title",
+                "domain",
+                "short_description",
+                "full_description",
+                "deadline",
+                "delivery_instructions",
+                "created_at",
+                "updated_at",
+                "user_id",
+            ],
+            batch,
+        )
+
+    # Distinct (project, learner) pairs: walk projects first, then shift the learner
+    submission_rows = []
+    for n in range(submissions):
+        pid, owner_id, project_created = project_rows[n % projects]
+        learner_id = user_ids[(n % projects + 1 + n // projects) % users]
+        created_at = project_created + timedelta(seconds=rng.randint(60, 30 * 86400))
+        submission_rows.append((str(uuid.uuid4()), pid, learner_id, owner_id, created_at))
+    for batch in _batched(
+        (
+            (sid, pid, learner_id, f"https://example.com/work/{sid}", created_at)
+            for sid, pid, learner_id, _owner, created_at in submission_rows
+        ),
+        batch_size,
+    ):
+        await _copy(db, "submissions", ["id", "project_id", "learner_id", "link", "created_at"], batch)
+
+    def message_rows():
+        if not submission_rows:
+            return
+        for n in range(messages):
+            sid, _pid, learner_id, owner_id, created_at = submission_rows[n % len(submission_rows)]
+            position = n // len(submission_rows)
+            sender_id = learner_id if position % 2 == 0 else owner_id
+            yield (
+                str(uuid.uuid4()),
+                sid,
+                sender_id,
+                f"Synthetic message {position} in this thread.",
+                created_at + timedelta(minutes=position),
+            )
+
+    for batch in _batched(message_rows(), batch_size):
+        await _copy(db, "messages", ["id", "submission_id", "sender_id", "body", "created_at"], batch)
+
+    await recompute_thread_counters(db)
     await db.commit()
+    return {
+        "users": users,
+        "projects": projects,
+        "submissions": submissions,
+        "messages": messages if submission_rows else 0,
+    }
@@ -0,0 +1 @@
+# Benchmarks (run against a real Postgres, not part of pytest)
@@ -0,0 +1,294 @@
+"""Load benchmark for the API hot paths at several dataset sizes.
+
+For each size the database is topped up with synthetic data (app.seed.seed_synthetic)
+until it holds at least that many rows, then each scenario runs for --duration seconds
+with --concurrency async clients:
+
+    GET /projects (full and view=summary), GET /projects/{id}, POST /auth/login,
+    POST /submissions/{id}/messages, GET /submissions/me
+
+Latency p50/p95/p99 and requests/s are printed and written as JSON (with the git commit)
+so runs can be compared:
+
+    uv run python -m benchmarks.api_load --sizes small,medium --concurrency 32
+    uv run python -m benchmarks.api_load --compare benchmarks/results/<old>.json
+
+By default requests go through the ASGI app in-process; pass --base-url to load a running
+server instead (seeding still uses DATABASE_URL, so point both at the same database).
+Synthetic rows are only added, never removed: use a dedicated database.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Login is part of the load; the per-IP auth limit would turn it into 429s
+os.environ.setdefault("RATE_LIMIT_AUTH", "1000000/minute")
+
+import httpx
+from sqlalchemy import func, select
+
+from app.config import SEED_PASSWORD
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models.message import Message
+from app.models.project import Project
+from app.models.submission import Submission
+from app.models.user import User
+from app.seed import seed_synthetic
+
+SIZES = {
+    "small": {"users": 100, "projects": 500, "submissions": 2_000, "messages": 10_000},
+    "medium": {"users": 1_000, "projects": 5_000, "submissions": 20_000, "messages": 100_000},
+    "large": {"users": 10_000, "projects": 50_000, "submissions": 200_000, "messages": 1_000_000},
+}
+RESULTS_DIR = Path(__file__).parent / "results"
+_COUNTED = {"users": User, "projects": Project, "submissions": Submission, "messages": Message}
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def _row_counts() -> dict[str, int]:
+    async with AsyncSessionLocal() as db:
+        return {
+            name: await db.scalar(select(func.count()).select_from(model))
+            for name, model in _COUNTED.items()
+        }
+
+
+async def ensure_size(target: dict[str, int]) -> dict[str, int]:
+    """Add synthetic rows until each table holds at least the target count."""
+    current = await _row_counts()
+    missing = {name: max(0, target[name] - current[name]) for name in target}
+    if any(missing.values()):
+        async with AsyncSessionLocal() as db:
+            await seed_synthetic(
+                db,
+                users=max(missing["users"], 1),
+                projects=max(missing["projects"], 1),
+                submissions=missing["submissions"],
+                messages=missing["messages"],
+            )
+    return await _row_counts()
+
+
+async def _fixtures(clients: int) -> dict:
+    """Ids and credentials the scenarios pick from."""
+    async with AsyncSessionLocal() as db:
+        project_ids = (
+            await db.scalars(select(Project.id).order_by(func.random()).limit(1000))
+        ).all()
+        threads = (
+            await db.execute(
+                select(User.email, Submission.id)
+                .join(Submission, Submission.learner_id == User.id)
+                .where(User.email.like("synthetic-%"))
+                .order_by(func.random())
+                .limit(clients)
+            )
+        ).all()
+    return {"project_ids": project_ids, "threads": threads}
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> dict:
+    r = await client.post("/auth/login", json={"email": email, "password": SEED_PASSWORD})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _scenarios(fixtures: dict) -> dict:
+    """name -> async fn(client, worker_index, headers) returning the response."""
+    project_ids = fixtures["project_ids"]
+    threads = fixtures["threads"]
+
+    async def list_projects(client, _i, _headers):
+        return await client.get("/projects", params={"limit": 20})
+
+    async def list_project_summaries(client, _i, _headers):
+        return await client.get("/projects", params={"limit": 20, "view": "summary"})
+
+    async def get_project(client, _i, _headers):
+        return await client.get(f"/projects/{random.choice(project_ids)}")
+
+    async def login(client, i, _headers):
+        email = threads[i % len(threads)].email
+        return await client.post("/auth/login", json={"email": email, "password": SEED_PASSWORD})
+
+    async def post_message(client, i, headers):
+        submission_id = threads[i % len(threads)].id
+        return await client.post(
+            f"/submissions/{submission_id}/messages",
+            json={"body": "Benchmark message"},
+            headers=headers,
+        )
+
+    async def my_submissions(client, _i, headers):
+        return await client.get("/submissions/me", headers=headers)
+
+    return {
+        "GET /projects": list_projects,
+        "GET /projects?view=summary": list_project_summaries,
+        "GET /projects/{id}": get_project,
+        "POST /auth/login": login,
+        "POST /submissions/{id}/messages": post_message,
+        "GET /submissions/me": my_submissions,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request,
+    headers: list[dict],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    async def worker(i: int):
+        nonlocal errors
+        while (now := time.perf_counter()) < stop_at:
+            r = await request(client, i, headers[i])
+            if now < measure_from:
+                continue
+            latencies.append(time.perf_counter() - now)
+            if r.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_table(size: str, rows: dict[str, int], results: dict[str, dict]) -> None:
+    print(f"\n{size}: " + ", ".join(f"{n} {name}" for name, n in rows.items()))
+    print(f"{'scenario':<34}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<34}{r['rps']:>9.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+            f"{r['p99_ms']:>9.2f}{r['errors']:>8}"
+        )
+
+
+def compare(current: dict, baseline_path: Path) -> None:
+    """Print rps and p95 change against an earlier results file."""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path.name} (commit {baseline.get('commit')})")
+    print(f"{'size':<8}{'scenario':<34}{'rps':>10}{'p95':>10}")
+    for size, run in current["runs"].items():
+        old_run = baseline["runs"].get(size)
+        if not old_run:
+            continue
+        for name, r in run["scenarios"].items():
+            old = old_run["scenarios"].get(name)
+            if not old or not old["rps"] or not old["p95_ms"]:
+                continue
+            rps = (r["rps"] / old["rps"] - 1) * 100
+            p95 = (r["p95_ms"] / old["p95_ms"] - 1) * 100
+            print(f"{size:<8}{name:<34}{rps:>+9.1f}%{p95:>+9.1f}%")
+
+
+async def main(args: argparse.Namespace) -> dict:
+    results: dict = {
+        "benchmark": "api_load",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "runs": {},
+    }
+    if args.base_url:
+        transport = None
+        lifespan = None
+    else:
+        transport = httpx.ASGITransport(app=app)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=args.base_url or "http://bench", timeout=60
+        ) as client:
+            for size in args.sizes:
+                rows = await ensure_size(SIZES[size])
+                fixtures = await _fixtures(args.concurrency)
+                threads = fixtures["threads"]
+                headers = [
+                    await _login(client, threads[i % len(threads)].email)
+                    for i in range(args.concurrency)
+                ]
+                scenarios = _scenarios(fixtures)
+                size_results = {}
+                for name, request in scenarios.items():
+                    if args.only and name not in args.only:
+                        continue
+                    size_results[name] = await run_scenario(
+                        client, request, headers, args.concurrency, args.duration, args.warmup
+                    )
+                results["runs"][size] = {"rows": rows, "scenarios": size_results}
+                _print_table(size, rows, size_results)
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="small", help=f"comma-separated: {', '.join(SIZES)}")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds before measuring")
+    parser.add_argument("--only", action="append", help="run just this scenario (repeatable)")
+    parser.add_argument("--base-url", help="running API, e.g. http://localhost:8030")
+    parser.add_argument("--output", type=Path, help="results JSON (default benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to diff against")
+    args = parser.parse_args()
+    args.sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in args.sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    results = asyncio.run(main(args))
+    output = args.output or RESULTS_DIR / (
+        f"api_load-{results['commit'] or 'nogit'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nwrote {output}")
+    if args.compare:
+        compare(results, args.compare)
@@ -0,0 +1,142 @@
+"""Round-trips saved by get_read_db on the read-only routes.
+
+The app connects to Postgres through a local TCP proxy that counts request/response
+exchanges (one round-trip = client sends, then waits for the server). Each route is run
+with get_read_db as shipped and with it overridden to get_db (transaction + COMMIT).
+
+    uv run python -m benchmarks.readonly_session [--requests 200] [--latency-ms 0]
+
+--latency-ms delays every server reply to mimic a remote database. Needs the same
+DATABASE_URL / POSTGRES_* env as the API.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+from sqlalchemy.engine import make_url
+
+
+class RoundTripProxy:
+    """Forward TCP to the database and count client->server round-trips."""
+
+    def __init__(self, target_host: str, target_port: int, latency: float = 0.0):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.latency = latency
+        self.round_trips = 0
+        self._server: asyncio.base_events.Server | None = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+
+    async def _handle(self, client_r, client_w):
+        server_r, server_w = await asyncio.open_connection(self.target_host, self.target_port)
+        awaiting_reply = False
+
+        async def upstream():
+            nonlocal awaiting_reply
+            while data := await client_r.read(65536):
+                if not awaiting_reply:
+                    self.round_trips += 1
+                    awaiting_reply = True
+                server_w.write(data)
+                await server_w.drain()
+            server_w.close()
+
+        async def downstream():
+            nonlocal awaiting_reply
+            while data := await server_r.read(65536):
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                awaiting_reply = False
+                client_w.write(data)
+                await client_w.drain()
+            client_w.close()
+
+        await asyncio.gather(upstream(), downstream(), return_exceptions=True)
+
+
+def _target_url():
+    if url := os.getenv("DATABASE_URL"):
+        return make_url(url)
+    return make_url(
+        "postgresql+asyncpg://{}:{}@{}:{}/{}".format(
+            os.getenv("POSTGRES_USER", "toolme"),
+            os.getenv("POSTGRES_PASSWORD", "toolme"),
+            os.getenv("POSTGRES_HOST", "localhost"),
+            os.getenv("POSTGRES_PORT", "5432"),
+            os.getenv("POSTGRES_DB", "toolme"),
+        )
+    )
+
+
+async def main(requests: int, latency_ms: float) -> None:
+    target = _target_url()
+    proxy = RoundTripProxy(target.host or "localhost", target.port or 5432, latency_ms / 1000)
+    port = await proxy.start()
+    # Must be set before app.database builds the engine
+    os.environ["DATABASE_URL"] = target.set(host="127.0.0.1", port=port).render_as_string(
+        hide_password=False
+    )
+    os.environ.setdefault("RATE_LIMIT_AUTH", "1000/minute")
+
+    import httpx
+
+    from app.database import get_db, get_read_db
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            email = f"bench-{uuid.uuid4().hex}@example.com"
+            password = "benchpass1234"
+            await client.post(
+                "/auth/signup",
+                json={"email": email, "password": password, "password_confirm": password},
+            )
+            r = await client.post("/auth/login", json={"email": email, "password": password})
+            headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+            project_id = (await client.get("/projects?limit=1")).json()["items"][0]["id"]
+            routes = [
+                ("GET /projects", "/projects", {}),
+                ("GET /projects/{id}", f"/projects/{project_id}", {}),
+                ("GET /submissions/me", "/submissions/me", headers),
+            ]
+
+            print(f"{requests} requests per route, +{latency_ms:g} ms per DB reply")
+            print(f"{'route':<22}{'session':<13}{'round-trips/req':>16}{'ms/req':>10}")
+            for label, path, hdrs in routes:
+                for mode in ("get_db", "get_read_db"):
+                    if mode == "get_db":
+                        app.dependency_overrides[get_read_db] = get_db
+                    else:
+                        app.dependency_overrides.clear()
+                    # Warm up: pool connections, statement caches, user cache
+                    for _ in range(5):
+                        assert (await client.get(path, headers=hdrs)).status_code == 200
+                    proxy.round_trips = 0
+                    start = time.perf_counter()
+                    for _ in range(requests):
+                        await client.get(path, headers=hdrs)
+                    elapsed = time.perf_counter() - start
+                    print(
+                        f"{label:<22}{mode:<13}{proxy.round_trips / requests:>16.2f}"
+                        f"{elapsed / requests * 1000:>10.2f}"
+                    )
+            app.dependency_overrides.clear()
+    await proxy.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency_ms))
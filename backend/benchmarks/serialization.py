@@ -0,0 +1,123 @@
+"""Microbenchmark: building and serializing one /projects page, old path vs new.
+
+Each pipeline runs --repeat times on the newest --limit projects (default 100) and the
+median per page and per item is printed:
+
+    rows + build    read the page and build the response models
+      orm           select(Project) -> ORM instances -> ProjectResponse(...) per row
+      columns       select(columns) -> plain rows -> one TypeAdapter.validate_python call
+    encode          turn a built page into JSON bytes
+      jsonable      jsonable_encoder + json.dumps (what a plain JSONResponse does)
+      to_json       pydantic_core.to_json (FastJSONResponse)
+      dump_json     the response_model serializer FastAPI uses for routes returning models
+
+    uv run python -m benchmarks.serialization --limit 100 --repeat 200
+
+Reads only; needs at least --limit projects in DATABASE_URL (benchmarks.api_load or
+app.seed can add synthetic ones).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import select
+
+from app.crud.projects import _PROJECT_COLUMNS, _project_items, _row_to_response
+from app.database import AsyncSessionLocal
+from app.models.project import Project
+from app.schemas.project import ProjectListResponse
+
+_page = TypeAdapter(ProjectListResponse)
+
+
+async def _orm_page(db, limit: int) -> ProjectListResponse:
+    result = await db.execute(
+        select(Project).order_by(Project.created_at.desc(), Project.id.desc()).limit(limit)
+    )
+    items = [_row_to_response(r) for r in result.scalars().all()]
+    # Fresh instances every run, as in a request (no identity map reuse)
+    db.expunge_all()
+    return ProjectListResponse(items=items, total=None)
+
+
+async def _columns_page(db, limit: int) -> ProjectListResponse:
+    result = await db.execute(
+        select(*_PROJECT_COLUMNS)
+        .order_by(Project.created_at.desc(), Project.id.desc())
+        .limit(limit)
+    )
+    items = _project_items.validate_python(result.all(), from_attributes=True)
+    return ProjectListResponse(items=items, total=None)
+
+
+def _median_ms(samples: list[float]) -> float:
+    return statistics.median(samples) * 1000
+
+
+async def _time_async(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _print_rows(title: str, results: dict[str, float], items: int) -> None:
+    print(f"\n{title}")
+    print(f"{'pipeline':<14}{'ms/page':>10}{'us/item':>10}")
+    for name, ms in results.items():
+        print(f"{name:<14}{ms:>10.3f}{ms * 1000 / items:>10.2f}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        page = await _columns_page(db, args.limit)
+        items = len(page.items)
+        if items < args.limit:
+            print(f"only {items} projects in the database; results are per {items} items")
+        if items == 0:
+            return
+        # Warm up both paths (statement caches, connection)
+        await _orm_page(db, args.limit)
+        await _columns_page(db, args.limit)
+        build = {
+            "orm": _median_ms(await _time_async(lambda: _orm_page(db, args.limit), args.repeat)),
+            "columns": _median_ms(
+                await _time_async(lambda: _columns_page(db, args.limit), args.repeat)
+            ),
+        }
+
+    encode = {
+        "jsonable": _median_ms(
+            _time(lambda: json.dumps(jsonable_encoder(page)).encode(), args.repeat)
+        ),
+        "to_json": _median_ms(_time(lambda: to_json(page), args.repeat)),
+        "dump_json": _median_ms(_time(lambda: _page.dump_json(page), args.repeat)),
+    }
+    _print_rows(f"rows + build ({items} projects, median of {args.repeat})", build, items)
+    _print_rows("encode", encode, items)
+    saved = build["orm"] - build["columns"]
+    print(f"\ncolumns saves {saved * 1000 / items:.2f} us/item ({saved:.3f} ms/page) over orm")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100, help="projects per page")
+    parser.add_argument("--repeat", type=int, default=200, help="runs per pipeline")
+    asyncio.run(main(parser.parse_args()))
@@ -4,6 +4,7 @@ import os
 os.environ.setdefault("RATE_LIMIT_AUTH", "1000/minute")
 
 import uuid
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
@@ -13,28 +14,30 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth import create_access_token
 from app.database import AsyncSessionLocal, engine
 from app.main import app
-from app.models.base import Base
+from app.migrations import migrate
 from app.models.message import Message  # noqa: F401 - register with Base
 from app.models.project import Project  # noqa: F401 - register with Base
 from app.models.submission import Submission  # noqa: F401 - register with Base
 from app.models.user import User  # noqa: F401 - register with Base
-from app.seed import seed_if_empty
+from app.query_stats import record_queries
+from app.seed import seed_defaults
 
 
 @pytest.fixture
-def client():
-    """FastAPI test client. Lifespan runs on first request (tables + seed)."""
+def client(ensure_tables):
+    """FastAPI test client on a migrated and seeded database."""
+    # Pooled connections from async tests belong to pytest's event loop, not TestClient's
+    engine.sync_engine.dispose(close=False)
     with TestClient(app, raise_server_exceptions=False) as c:
         yield c
 
 
 @pytest.fixture(scope="session")
 async def ensure_tables():
-    """Create tables and seed once per test session (same event loop for all async tests)."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Migrate and seed once per test session (same event loop for all async tests)."""
+    await migrate(engine)
     async with AsyncSessionLocal() as session:
-        await seed_if_empty(session)
+        await seed_defaults(session)
 
 
 @pytest.fixture
@@ -60,10 +63,88 @@ def auth_headers(client: TestClient):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def auth_headers_for(client: TestClient):
+    """Sign up (if new) and log in a given user, return Authorization headers.
+
+        owner = auth_headers_for("owner@example.com", "testpass1234")
+    """
+
+    def login(email: str, password: str) -> dict[str, str]:
+        client.post(
+            "/auth/signup",
+            json={"email": email, "password": password, "password_confirm": password},
+        )
+        r = client.post("/auth/login", json={"email": email, "password": password})
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    return login
+
+
 @pytest.fixture
 async def seed_user_id(db_session: AsyncSession):
-    """Return the seed user id for crud tests (seed_if_empty creates this user)."""
+    """Return the seed user id for crud tests (seed_defaults creates this user)."""
     result = await db_session.execute(select(User).limit(1))
     user = result.scalar_one_or_none()
     assert user is not None, "Seed user should exist after ensure_tables"
     return user.id
+
+
+@pytest.fixture
+def thread_with_messages(client: TestClient):
+    """Create a project and a submission, then post count follow-up messages; returns
+    the submission id.
+
+        submission_id = thread_with_messages(auth_headers, 3)
+    """
+
+    def make(headers: dict[str, str], count: int) -> str:
+        r = client.post(
+            "/projects",
+            json={
+                "title": "P",
+                "domain": "D",
+                "short_description": "S",
+                "full_description": "F",
+                "deadline": "2026-12-31",
+            },
+            headers=headers,
+        )
+        assert r.status_code == 201
+        r2 = client.post(
+            f"/projects/{r.json()['id']}/submissions",
+            json={"message": "m0"},
+            headers=headers,
+        )
+        assert r2.status_code == 201
+        submission_id = r2.json()["id"]
+        for i in range(1, count + 1):
+            r3 = client.post(
+                f"/submissions/{submission_id}/messages",
+                json={"body": f"m{i}"},
+                headers=headers,
+            )
+            assert r3.status_code == 201
+        return submission_id
+
+    return make
+
+
+@pytest.fixture
+def query_budget():
+    """Fail when a block runs more SQL queries than allowed (N+1 guard).
+
+        with query_budget(3):
+            client.get("/projects")
+    """
+
+    @contextmanager
+    def budget(max_queries: int):
+        with record_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries, budget {max_queries}:\n" + "\n".join(stats.statements)
+        )
+
+    return budget
@@ -1,8 +1,11 @@
 """API tests: health, root, projects CRUD."""
 
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.crud.projects import clear_project_caches
 from app.main import app
 
 
@@ -12,6 +15,28 @@ def test_health(client: TestClient):
     assert r.json() == {"status": "ok"}
 
 
+def test_internal_stats_db_pool(client: TestClient):
+    client.get("/projects")
+    r = client.get("/internal/stats")
+    assert r.status_code == 200
+    pool = r.json()["db_pool"]
+    assert pool["size"] >= 1
+    assert pool["checked_out"] >= 0
+    assert pool["idle"] >= 1
+    wait = pool["checkout_wait_seconds"]
+    assert wait["count"] >= 1
+    assert wait["buckets"]["+Inf"] == wait["count"]
+
+
+def test_internal_stats_project_cache(client: TestClient):
+    client.get("/projects/1")
+    client.get("/projects/1")
+    stats = client.get("/internal/stats").json()
+    assert stats["project_cache"]["hits"] >= 1
+    assert {"loads", "coalesced", "hit_ratio"} <= stats["project_cache"].keys()
+    assert stats["cache_invalidation"]["backend"] == "postgres"
+
+
 def test_root(client: TestClient):
     r = client.get("/")
     assert r.status_code == 200
@@ -35,6 +60,83 @@ def test_list_projects(client: TestClient):
         assert "deadline" in project
 
 
+def test_list_projects_summary_view(client: TestClient, auth_headers, query_budget):
+    clear_project_caches()
+    with query_budget(2) as stats:
+        r = client.get("/projects?view=summary&limit=5")
+    assert r.status_code == 200
+    assert not any("full_description" in s for s in stats.statements)
+    items = r.json()["items"]
+    assert items
+    assert set(items[0]) == {
+        "id", "title", "domain", "short_description", "deadline", "user_id", "created_at", "updated_at",
+    }
+    # Same rows as the full view, but not the same representation (ETag)
+    full = client.get("/projects?limit=5")
+    assert [p["id"] for p in full.json()["items"]] == [p["id"] for p in items]
+    assert full.headers["ETag"] != r.headers["ETag"]
+    assert client.get("/projects?view=everything").status_code == 422
+
+    client.post(
+        "/projects",
+        json={
+            "title": "Mine",
+            "domain": "D",
+            "short_description": "S",
+            "full_description": "F",
+            "deadline": "2026-12-31",
+        },
+        headers=auth_headers,
+    )
+    mine = client.get("/projects/me?view=summary", headers=auth_headers).json()
+    assert mine[0]["title"] == "Mine"
+    assert "full_description" not in mine[0]
+
+
+def test_project_sparse_fields(client: TestClient, auth_headers, query_budget):
+    clear_project_caches()
+    with query_budget(2) as stats:
+        r = client.get("/projects?fields=id,title&limit=3")
+    assert r.status_code == 200
+    assert "short_description" not in stats.statements[0]
+    page = r.json()
+    assert {"items", "total", "next_cursor"} <= page.keys()
+    assert all(set(p) == {"id", "title"} for p in page["items"])
+    assert r.headers["ETag"] != client.get("/projects?limit=3").headers["ETag"]
+    assert client.get(
+        "/projects?fields=id,title&limit=3", headers={"If-None-Match": r.headers["ETag"]}
+    ).status_code == 304
+
+    project_id = page["items"][0]["id"]
+    r2 = client.get(f"/projects/{project_id}?fields=deadline")
+    assert r2.json() == {"deadline": client.get(f"/projects/{project_id}").json()["deadline"]}
+    assert client.get(
+        f"/projects/{project_id}?fields=deadline", headers={"If-None-Match": r2.headers["ETag"]}
+    ).status_code == 304
+    # Sparse responses are encoded separately; dates must come out the same
+    full = client.get(f"/projects/{project_id}").json()
+    dates = client.get(f"/projects/{project_id}?fields=created_at,updated_at").json()
+    assert dates == {"created_at": full["created_at"], "updated_at": full["updated_at"]}
+
+    client.post(
+        "/projects",
+        json={
+            "title": "Sparse mine",
+            "domain": "D",
+            "short_description": "S",
+            "full_description": "F",
+            "deadline": "2026-12-31",
+        },
+        headers=auth_headers,
+    )
+    mine = client.get("/projects/me?fields=title", headers=auth_headers).json()
+    assert mine[0] == {"title": "Sparse mine"}
+    r3 = client.get("/projects?fields=title,secret")
+    assert r3.status_code == 400
+    assert r3.json()["detail"] == "Unknown fields: secret"
+    assert client.get("/projects?fields=,").status_code == 400
+
+
 def test_get_project(client: TestClient):
     r = client.get("/projects")
     assert r.status_code == 200
@@ -157,6 +259,48 @@ def test_update_project_multiple_fields(client: TestClient, auth_headers):
     assert data["delivery_instructions"] == "Updated instructions"
 
 
+def test_get_project_etag(client: TestClient, auth_headers):
+    payload = {
+        "title": "Cached",
+        "domain": "D",
+        "short_description": "S",
+        "full_description": "F",
+        "deadline": "2026-12-31",
+    }
+    project_id = client.post("/projects", json=payload, headers=auth_headers).json()["id"]
+    r = client.get(f"/projects/{project_id}")
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert r.headers["Cache-Control"] == "public, no-cache"
+    r2 = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+    assert r2.headers["ETag"] == etag
+    assert client.get(f"/projects/{project_id}", headers={"If-None-Match": '"stale"'}).status_code == 200
+    # An update changes the version, so the old ETag no longer matches
+    client.put(f"/projects/{project_id}", json={"title": "Cached v2"}, headers=auth_headers)
+    r3 = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert r3.status_code == 200
+    assert r3.json()["title"] == "Cached v2"
+    assert r3.headers["ETag"] != etag
+    assert client.get(
+        "/projects/no-such-id", headers={"If-None-Match": etag}
+    ).status_code == 404
+
+
+def test_list_projects_etag(client: TestClient):
+    # Uncompressed, so the ETag is the strong one (compressed bodies get W/)
+    r = client.get("/projects?limit=5", headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert r.headers["Cache-Control"].startswith("public, max-age=")
+    etag = r.headers["ETag"]
+    r2 = client.get("/projects?limit=5", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert r2.status_code == 304
+    assert r2.headers["Cache-Control"] == r.headers["Cache-Control"]
+    assert client.get("/projects?limit=4", headers={"If-None-Match": etag}).status_code == 200
+
+
 def test_delete_project(client: TestClient, auth_headers):
     payload = {
         "title": "To delete",
@@ -172,3 +316,107 @@ def test_delete_project(client: TestClient, auth_headers):
     assert r2.status_code == 204
     r3 = client.get(f"/projects/{project_id}")
     assert r3.status_code == 404
+
+
+def test_delete_project_background(client: TestClient, auth_headers, auth_headers_for):
+    payload = {
+        "title": "Purge me",
+        "domain": "D",
+        "short_description": "S",
+        "full_description": "F",
+        "deadline": "2026-12-31",
+    }
+    project_id = client.post("/projects", json=payload, headers=auth_headers).json()["id"]
+    r = client.post(
+        f"/projects/{project_id}/submissions", json={"message": "Hi"}, headers=auth_headers
+    )
+    assert r.status_code == 201
+    other = auth_headers_for(f"other-{uuid.uuid4().hex}@example.com", "testpass1234")
+    assert client.delete(f"/projects/{project_id}?background=true", headers=other).status_code == 404
+    r2 = client.delete(f"/projects/{project_id}?background=true", headers=auth_headers)
+    assert r2.status_code == 202
+    # TestClient runs background tasks before returning
+    assert client.get(f"/projects/{project_id}").status_code == 404
+    # Both outcomes are documented
+    paths = client.get("/openapi.json").json()["paths"]
+    assert {"202", "204"} <= paths["/projects/{project_id}"]["delete"]["responses"].keys()
+
+
+def test_list_projects_cursor_pagination(client: TestClient, auth_headers):
+    for i in range(3):
+        r = client.post(
+            "/projects",
+            json={
+                "title": f"Cursor {i}",
+                "domain": "D",
+                "short_description": "S",
+                "full_description": "F",
+                "deadline": "2026-12-31",
+            },
+            headers=auth_headers,
+        )
+        assert r.status_code == 201
+    first = client.get("/projects?limit=2").json()
+    assert first["total"] >= 3
+    assert first["next_cursor"]
+    r = client.get(f"/projects?limit=2&after={first['next_cursor']}")
+    assert r.status_code == 200
+    second = r.json()
+    assert second["total"] is None
+    first_ids = {p["id"] for p in first["items"]}
+    assert second["items"]
+    assert not first_ids & {p["id"] for p in second["items"]}
+    # Cursor page matches the equivalent offset page
+    offset_page = client.get("/projects?skip=2&limit=2").json()
+    assert [p["id"] for p in second["items"]] == [p["id"] for p in offset_page["items"]]
+
+
+def test_list_projects_cursor_include_total(client: TestClient):
+    first = client.get("/projects?limit=1").json()
+    r = client.get(f"/projects?limit=1&after={first['next_cursor']}&include_total=true")
+    assert r.status_code == 200
+    assert r.json()["total"] == first["total"]
+
+
+def test_list_projects_invalid_cursor(client: TestClient):
+    r = client.get("/projects?after=not-a-cursor")
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
+def test_search_projects(client: TestClient, auth_headers):
+    token = uuid.uuid4().hex[:12]
+    for title, full in (
+        (f"Zebra {token} tracker", "Track zebras."),
+        ("Unrelated", f"Mentions {token} only in the full description."),
+    ):
+        r = client.post(
+            "/projects",
+            json={
+                "title": title,
+                "domain": "D",
+                "short_description": "S",
+                "full_description": full,
+                "deadline": "2026-12-31",
+            },
+            headers=auth_headers,
+        )
+        assert r.status_code == 201
+    r = client.get(f"/projects/search?q={token}")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 2
+    # Title match ranks above a full_description match
+    assert data["items"][0]["title"].startswith("Zebra")
+    r2 = client.get(f"/projects/search?q={token}&limit=1&skip=1")
+    assert [p["title"] for p in r2.json()["items"]] == ["Unrelated"]
+
+
+def test_search_projects_no_match(client: TestClient):
+    r = client.get(f"/projects/search?q=nomatch{uuid.uuid4().hex}")
+    assert r.status_code == 200
+    assert r.json() == {"items": [], "total": 0, "next_cursor": None}
+
+
+def test_search_projects_requires_query(client: TestClient):
+    assert client.get("/projects/search").status_code == 422
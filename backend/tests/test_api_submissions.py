@@ -6,18 +6,6 @@ import pytest
 from fastapi.testclient import TestClient
 
 
-def _auth_headers_for(client: TestClient, email: str, password: str):
-    """Sign up and log in, return Authorization headers."""
-    client.post(
-        "/auth/signup",
-        json={"email": email, "password": password, "password_confirm": password},
-    )
-    r = client.post("/auth/login", json={"email": email, "password": password})
-    assert r.status_code == 200
-    token = r.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
-
-
 def test_create_submission(client: TestClient, auth_headers):
     """Create a project, then submit a solution as the same user (learner)."""
     r = client.post(
@@ -214,6 +202,29 @@ def test_list_project_submissions_as_owner(client: TestClient, auth_headers):
     assert r2.json() == []
 
 
+def test_submission_lists_sparse_fields(
+    client: TestClient, auth_headers, thread_with_messages
+):
+    submission_id = thread_with_messages(auth_headers, 1)
+    r = client.get("/submissions/me?fields=id,unread_count", headers=auth_headers)
+    assert r.status_code == 200
+    mine = next(s for s in r.json() if s["id"] == submission_id)
+    assert mine == {"id": submission_id, "unread_count": 0}
+    project_id = client.get(f"/submissions/{submission_id}", headers=auth_headers).json()[
+        "project_id"
+    ]
+    r2 = client.get(
+        f"/projects/{project_id}/submissions?fields=learner_id,message_count",
+        headers=auth_headers,
+    )
+    assert r2.status_code == 200
+    assert set(r2.json()[0]) == {"learner_id", "message_count"}
+    assert r2.json()[0]["message_count"] == 2
+    r3 = client.get("/submissions/me?fields=id,password_hash", headers=auth_headers)
+    assert r3.status_code == 400
+    assert r3.json()["detail"] == "Unknown fields: password_hash"
+
+
 def test_projects_pagination(client: TestClient):
     r = client.get("/projects?skip=0&limit=5")
     assert r.status_code == 200
@@ -243,13 +254,13 @@ def test_projects_my_submission_404(client: TestClient, auth_headers):
     assert r2.status_code == 404
 
 
-def test_patch_submission_coherent(client: TestClient):
+def test_patch_submission_coherent(client: TestClient, auth_headers_for):
     """Owner marks submission as coherent (two users: owner and learner)."""
     password = "testpass1234"
     owner_email = f"owner-{uuid.uuid4().hex}@example.com"
     learner_email = f"learner-{uuid.uuid4().hex}@example.com"
-    owner_h = _auth_headers_for(client, owner_email, password)
-    learner_h = _auth_headers_for(client, learner_email, password)
+    owner_h = auth_headers_for(owner_email, password)
+    learner_h = auth_headers_for(learner_email, password)
     r = client.post(
         "/projects",
         json={
@@ -277,3 +288,83 @@ def test_patch_submission_coherent(client: TestClient):
     )
     assert r3.status_code == 200
     assert r3.json()["coherent"] is True
+
+
+def test_list_messages_pages_backwards(
+    client: TestClient, auth_headers, thread_with_messages
+):
+    submission_id = thread_with_messages(auth_headers, 4)
+    url = f"/submissions/{submission_id}/messages"
+    r = client.get(f"{url}?limit=2", headers=auth_headers)
+    assert r.status_code == 200
+    page = r.json()
+    assert [m["body"] for m in page["items"]] == ["m3", "m4"]
+    assert page["has_older"] is True
+    assert page["has_newer"] is False
+    page = client.get(f"{url}?limit=2&before={page['before_cursor']}", headers=auth_headers).json()
+    assert [m["body"] for m in page["items"]] == ["m1", "m2"]
+    assert page["has_older"] is True
+    assert page["has_newer"] is True
+    page = client.get(f"{url}?limit=2&before={page['before_cursor']}", headers=auth_headers).json()
+    assert [m["body"] for m in page["items"]] == ["m0"]
+    assert page["has_older"] is False
+
+
+def test_list_messages_after_cursor_polls_new_messages(
+    client: TestClient, auth_headers, thread_with_messages
+):
+    submission_id = thread_with_messages(auth_headers, 1)
+    url = f"/submissions/{submission_id}/messages"
+    page = client.get(url, headers=auth_headers).json()
+    assert [m["body"] for m in page["items"]] == ["m0", "m1"]
+    cursor = page["after_cursor"]
+    empty = client.get(f"{url}?after={cursor}", headers=auth_headers).json()
+    assert empty["items"] == []
+    assert empty["after_cursor"] == cursor
+    client.post(url, json={"body": "m2"}, headers=auth_headers)
+    page = client.get(f"{url}?after={cursor}", headers=auth_headers).json()
+    assert [m["body"] for m in page["items"]] == ["m2"]
+    assert page["has_newer"] is False
+
+
+def test_list_messages_invalid_cursor_and_access(
+    client: TestClient, auth_headers, thread_with_messages, auth_headers_for
+):
+    submission_id = thread_with_messages(auth_headers, 0)
+    url = f"/submissions/{submission_id}/messages"
+    assert client.get(f"{url}?before=garbage", headers=auth_headers).status_code == 400
+    other = auth_headers_for(f"other-{uuid.uuid4().hex}@example.com", "testpass1234")
+    assert client.get(url, headers=other).status_code == 403
+    assert client.get("/submissions/missing/messages", headers=auth_headers).status_code == 404
+
+
+def test_get_submission_embeds_last_messages(
+    client: TestClient, auth_headers, thread_with_messages
+):
+    submission_id = thread_with_messages(auth_headers, 3)
+    r = client.get(f"/submissions/{submission_id}?messages_limit=2", headers=auth_headers)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["message_count"] == 4
+    assert [m["body"] for m in data["messages"]] == ["m2", "m3"]
+    older = client.get(
+        f"/submissions/{submission_id}/messages?before={data['messages_before_cursor']}",
+        headers=auth_headers,
+    ).json()
+    assert [m["body"] for m in older["items"]] == ["m0", "m1"]
+    full = client.get(f"/submissions/{submission_id}", headers=auth_headers).json()
+    assert len(full["messages"]) == 4
+    assert full["messages_before_cursor"] is None
+
+
+def test_submission_write_routes_check_access(
+    client: TestClient, auth_headers, thread_with_messages, auth_headers_for
+):
+    submission_id = thread_with_messages(auth_headers, 0)
+    other = auth_headers_for(f"other-{uuid.uuid4().hex}@example.com", "testpass1234")
+    r = client.post(f"/submissions/{submission_id}/messages", json={"body": "x"}, headers=other)
+    assert r.status_code == 403
+    assert client.post(f"/submissions/{submission_id}/read", headers=other).status_code == 403
+    r = client.post("/submissions/missing/messages", json={"body": "x"}, headers=auth_headers)
+    assert r.status_code == 404
+    assert client.post("/submissions/missing/read", headers=auth_headers).status_code == 404
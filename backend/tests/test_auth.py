@@ -1,10 +1,25 @@
 """API tests: signup, login."""
 
+import asyncio
+import threading
 import uuid
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.auth import (
+    PasswordHasher,
+    PasswordHasherBusy,
+    decode_access_token_cached,
+    hash_password,
+    password_hasher,
+    token_cache,
+    verify_password,
+)
+from app.crud.users import create_user, get_user_by_id_cached, user_cache
+from app.models.user import User
+from app.schemas.user import UserCreate
+
 
 def test_signup(client: TestClient):
     email = f"newuser-{uuid.uuid4().hex}@example.com"
@@ -106,3 +121,130 @@ def test_create_project_requires_auth(client: TestClient):
         },
     )
     assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_runs_off_the_event_loop():
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    hashed = await hasher.run(hash_password, "pass123456789")
+    task.cancel()
+    assert ticks > 1  # the loop kept running while bcrypt worked
+    assert await hasher.run(verify_password, "pass123456789", hashed) is True
+    assert hasher.stats()["completed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert hasher.stats()["running"] == 1
+    assert hasher.stats()["queued"] == 1
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run(release.wait)
+    release.set()
+    await asyncio.gather(*running)
+    stats = hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_cancelled_callers():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    release = threading.Event()
+    callers = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    # Both clients go away: the queued job is dropped, the running one cannot be
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    stats = hasher.stats()
+    assert stats["running"] == 1
+    assert stats["queued"] == 0
+    assert stats["cancelled"] == 1
+    assert stats["completed"] == 0
+    # The running job still takes a slot: one more fits (max_queue), not two
+    waiting = asyncio.create_task(hasher.run(release.wait))
+    await asyncio.sleep(0.05)
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run(release.wait)
+    release.set()
+    await waiting
+    for _ in range(200):
+        if not hasher.stats()["running"]:
+            break
+        await asyncio.sleep(0.01)
+    stats = hasher.stats()
+    assert stats["completed"] == 2
+    assert stats["queued"] == 0
+    assert stats["cancelled"] == 1
+
+
+def test_login_returns_503_when_hasher_busy(client: TestClient, monkeypatch):
+    async def busy(*args):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(password_hasher, "run", busy)
+    r = client.post(
+        "/auth/signup",
+        json={
+            "email": f"busy-{uuid.uuid4().hex}@example.com",
+            "password": "pass123456789",
+            "password_confirm": "pass123456789",
+        },
+    )
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
+def test_internal_stats(client: TestClient):
+    r = client.get("/internal/stats")
+    assert r.status_code == 200
+    stats = r.json()["password_hasher"]
+    assert stats["workers"] >= 1
+    assert {"running", "queued", "completed", "rejected"} <= stats.keys()
+
+
+def test_current_user_served_from_cache(client: TestClient, auth_headers):
+    assert client.get("/auth/me", headers=auth_headers).status_code == 200
+    users, tokens = user_cache.stats(), token_cache.stats()
+    r = client.get("/auth/me", headers=auth_headers)
+    assert r.status_code == 200
+    assert user_cache.stats()["hits"] == users["hits"] + 1
+    assert token_cache.stats()["hits"] == tokens["hits"] + 1
+
+
+@pytest.mark.asyncio
+async def test_user_cache_invalidated_on_orm_update(db_session):
+    user = await create_user(
+        db_session,
+        UserCreate(email=f"cached-{uuid.uuid4().hex}@example.com", password="testpass1234"),
+    )
+    await db_session.commit()
+    cached = await get_user_by_id_cached(db_session, user.id)
+    assert user_cache.get(user.id) is cached
+    row = await db_session.get(User, user.id)
+    row.email = f"renamed-{uuid.uuid4().hex}@example.com"
+    await db_session.commit()
+    assert user_cache.get(user.id) is None
+    fresh = await get_user_by_id_cached(db_session, user.id)
+    assert fresh.email == row.email
+
+
+def test_tampered_token_not_cached(client: TestClient, auth_headers):
+    token = auth_headers["Authorization"].split()[1]
+    bad = {"Authorization": f"Bearer {token[:-2]}xx"}
+    assert client.get("/auth/me", headers=bad).status_code == 401
+    assert decode_access_token_cached(token[:-2] + "xx") is None
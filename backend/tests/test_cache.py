@@ -0,0 +1,122 @@
+"""Unit tests for in-process caches and metric primitives."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.cache import LoadingCache, TTLCache
+from app.metrics import Histogram
+
+
+def test_get_set_and_stats():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expiry_and_ttl_override():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=0.05)
+    cache.set("expired", 1, ttl=-1)
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.get("expired") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_pop_and_disabled():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.pop("a")
+    assert cache.get("a") is None
+    off = TTLCache(maxsize=10, ttl=0)
+    off.set("a", 1)
+    assert off.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_loading_cache_coalesces_concurrent_misses():
+    cache = LoadingCache(maxsize=10, ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(5)))
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert await cache.get_or_load("k", load) == "value"
+    stats = cache.stats()
+    assert stats["loads"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_loading_cache_drops_load_invalidated_in_flight():
+    cache = LoadingCache(maxsize=10, ttl=60)
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "old"
+
+    task = asyncio.create_task(cache.get_or_load("k", load))
+    await asyncio.sleep(0.01)
+    cache.invalidate("k")
+    assert await task == "old"
+    assert cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_loading_cache_failed_load_and_none():
+    cache = LoadingCache(maxsize=10, ttl=60)
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def load():
+        return "retried"
+
+    leader = asyncio.create_task(cache.get_or_load("k", fail))
+    await asyncio.sleep(0.01)
+    # A waiter on a failed load runs its own loader
+    assert await cache.get_or_load("k", load) == "retried"
+    with pytest.raises(ValueError):
+        await leader
+
+    async def missing():
+        return None
+
+    assert await cache.get_or_load("none", missing) is None
+    assert cache.stats()["size"] == 1
+
+
+def test_histogram_cumulative_buckets():
+    h = Histogram(buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        h.observe(v)
+    snap = h.snapshot()
+    assert snap["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+    assert snap["count"] == 4
+    assert snap["sum"] == 4.05
@@ -0,0 +1,53 @@
+"""Response compression: negotiation, thresholds and the precompressed cache."""
+
+from fastapi.testclient import TestClient
+
+from app.compression import compressed_cache, negotiate
+
+
+def test_negotiate():
+    available = {"br": None, "gzip": None}
+    assert negotiate("gzip, deflate", available) == "gzip"
+    assert negotiate("gzip, br", available) == "br"
+    assert negotiate("br;q=0.5, gzip", available) == "gzip"
+    assert negotiate("gzip;q=0, *;q=0.1", available) == "br"
+    assert negotiate("identity", available) is None
+    assert negotiate("", available) is None
+    assert negotiate("gzip;q=oops", available) is None
+
+
+def test_project_compressed_and_cached(client: TestClient, auth_headers):
+    r = client.post(
+        "/projects",
+        json={
+            "title": "Compressible",
+            "domain": "D",
+            "short_description": "S",
+            "full_description": "A long description. " * 500,
+            "deadline": "2026-12-31",
+        },
+        headers=auth_headers,
+    )
+    project_id = r.json()["id"]
+    plain = client.get(f"/projects/{project_id}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    compressed_cache.clear()
+    hits = compressed_cache.hits
+    r = client.get(f"/projects/{project_id}", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert int(r.headers["Content-Length"]) < len(plain.content) // 10
+    assert r.json() == plain.json()
+    assert r.headers["ETag"] == f"W/{plain.headers['ETag']}"
+    again = client.get(f"/projects/{project_id}", headers={"Accept-Encoding": "gzip"})
+    assert again.json() == plain.json()
+    assert compressed_cache.hits == hits + 1
+    # The weak ETag still revalidates
+    assert client.get(
+        f"/projects/{project_id}", headers={"If-None-Match": r.headers["ETag"]}
+    ).status_code == 304
+
+    # Below the threshold: sent as is
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
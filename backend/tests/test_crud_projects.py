@@ -1,16 +1,32 @@
 """Direct unit tests for app.crud.projects (full coverage of crud layer)."""
 
+import asyncio
+import uuid
+
 import pytest
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache_invalidation import CacheInvalidator, PostgresInvalidationBackend
 from app.crud.projects import (
     create_project,
     delete_project,
     get_project,
+    get_project_cached,
     list_projects,
+    list_projects_cached,
+    project_cache,
+    purge_project,
     update_project,
 )
+from app.crud.submissions import add_message, create_submission
+from app.crud.users import create_user
+from app.models.message import Message
+from app.models.project import Project
+from app.models.submission import Submission
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.schemas.submission import MessageCreate, SubmissionCreate
+from app.schemas.user import UserCreate
 
 
 @pytest.mark.asyncio
@@ -113,6 +129,56 @@ async def test_delete_project(db_session: AsyncSession, seed_user_id: str):
     assert await get_project(db_session, created.id) is None
 
 
+async def _project_with_threads(db: AsyncSession, owner_id: str, learners: int) -> str:
+    """Project with one submission (three messages) per new learner."""
+    project = await create_project(
+        db,
+        ProjectCreate(
+            title="Busy",
+            domain="D",
+            short_description="S",
+            full_description="F",
+            deadline="2026-12-31",
+        ),
+        owner_id,
+    )
+    for _ in range(learners):
+        learner = await create_user(
+            db,
+            UserCreate(email=f"learner-{uuid.uuid4().hex}@example.com", password="testpass1234"),
+        )
+        sub = await create_submission(db, project.id, learner.id, SubmissionCreate(message="m0"))
+        for body in ("m1", "m2"):
+            await add_message(db, sub.id, learner.id, MessageCreate(body=body))
+    await db.commit()
+    return project.id
+
+
+async def _thread_rows(db: AsyncSession, project_id: str) -> tuple[int, int]:
+    submissions = select(Submission.id).where(Submission.project_id == project_id)
+    return (
+        await db.scalar(select(func.count()).select_from(submissions.subquery())),
+        await db.scalar(select(func.count()).where(Message.submission_id.in_(submissions))),
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_project_cascades_in_database(db_session: AsyncSession, seed_user_id: str):
+    project_id = await _project_with_threads(db_session, seed_user_id, learners=2)
+    assert await _thread_rows(db_session, project_id) == (2, 6)
+    assert await delete_project(db_session, project_id, seed_user_id) is True
+    await db_session.commit()
+    assert await _thread_rows(db_session, project_id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_purge_project_in_batches(db_session: AsyncSession, seed_user_id: str):
+    project_id = await _project_with_threads(db_session, seed_user_id, learners=3)
+    await purge_project(project_id, batch_size=2)
+    assert await _thread_rows(db_session, project_id) == (0, 0)
+    assert await get_project(db_session, project_id) is None
+
+
 @pytest.mark.asyncio
 async def test_delete_project_not_found(db_session: AsyncSession, seed_user_id: str):
     ok = await delete_project(
@@ -120,3 +186,83 @@ async def test_delete_project_not_found(db_session: AsyncSession, seed_user_id:
     )
     await db_session.commit()
     assert ok is False
+
+
+@pytest.mark.asyncio
+async def test_list_projects_cursor_walks_all_rows(db_session: AsyncSession):
+    full = await list_projects(db_session, limit=100)
+    seen = []
+    page = await list_projects(db_session, limit=2, include_total=False)
+    assert page.total is None
+    seen.extend(p.id for p in page.items)
+    while page.next_cursor:
+        page = await list_projects(db_session, limit=2, after=page.next_cursor)
+        seen.extend(p.id for p in page.items)
+    await db_session.commit()
+    assert seen[: len(full.items)] == [p.id for p in full.items]
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.asyncio
+async def test_project_cache_invalidated_by_writes(db_session: AsyncSession, seed_user_id: str):
+    payload = ProjectCreate(
+        title="Cached",
+        domain="D",
+        short_description="S",
+        full_description="F",
+        deadline="2026-12-31",
+    )
+    created = await create_project(db_session, payload, seed_user_id)
+    await db_session.commit()
+    assert (await get_project_cached(db_session, created.id)).title == "Cached"
+    assert project_cache.get(created.id) is not None
+    first_page = await list_projects_cached(db_session, limit=5)
+    assert first_page.items[0].id == created.id
+
+    await update_project(db_session, created.id, ProjectUpdate(title="Renamed"), seed_user_id)
+    await db_session.commit()
+    assert (await get_project_cached(db_session, created.id)).title == "Renamed"
+    assert (await list_projects_cached(db_session, limit=5)).items[0].title == "Renamed"
+
+    await delete_project(db_session, created.id, seed_user_id)
+    await db_session.commit()
+    assert await get_project_cached(db_session, created.id) is None
+    assert created.id not in {p.id for p in (await list_projects_cached(db_session, limit=5)).items}
+
+
+@pytest.mark.asyncio
+async def test_project_writes_notify_other_workers(db_session: AsyncSession, seed_user_id: str):
+    # A second invalidator on its own LISTEN connection plays another worker
+    received = []
+    other = CacheInvalidator(PostgresInvalidationBackend())
+    other.register("projects", received.append, lambda: received.append("reset"))
+    await other.start()
+    try:
+        created = await create_project(
+            db_session,
+            ProjectCreate(
+                title="Shared",
+                domain="D",
+                short_description="S",
+                full_description="F",
+                deadline="2026-12-31",
+            ),
+            seed_user_id,
+        )
+        await db_session.commit()
+        # Writes outside the app (psql, scripts) notify too: the trigger is in the database
+        await db_session.execute(
+            update(Project).where(Project.id == created.id).values(title="From SQL")
+        )
+        await db_session.commit()
+        await delete_project(db_session, created.id, seed_user_id)
+        await db_session.commit()
+        for _ in range(50):
+            if len(received) >= 4:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await other.stop()
+    assert received[0] == "reset"
+    assert received[1:] == [None, created.id, created.id]
+    assert other.stats()["received"] == 3
@@ -1,6 +1,9 @@
 """Direct unit tests for app.crud.submissions."""
 
+import uuid
+
 import pytest
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.projects import create_project as crud_create_project
@@ -12,10 +15,14 @@ from app.crud.submissions import (
     list_submissions_by_learner,
     list_submissions_by_project,
     mark_submission_read,
+    recompute_thread_counters,
     update_submission_coherent,
 )
+from app.crud.users import create_user
+from app.models.submission import Submission
 from app.schemas.project import ProjectCreate
 from app.schemas.submission import MessageCreate, SubmissionCreate, SubmissionCoherentUpdate
+from app.schemas.user import UserCreate
 
 
 @pytest.mark.asyncio
@@ -187,3 +194,127 @@ async def test_update_submission_coherent(db_session: AsyncSession, seed_user_id
     await db_session.commit()
     assert out is not None
     assert out.coherent is True
+
+
+@pytest.mark.asyncio
+async def test_thread_counts_per_viewer(db_session: AsyncSession, seed_user_id: str):
+    """message_count / unread_count are computed per side (learner vs owner)."""
+    learner = await create_user(
+        db_session,
+        UserCreate(email=f"learner-{uuid.uuid4().hex}@example.com", password="testpass1234"),
+    )
+    proj = await crud_create_project(
+        db_session,
+        ProjectCreate(
+            title="P",
+            domain="D",
+            short_description="S",
+            full_description="F",
+            deadline="2026-12-31",
+        ),
+        seed_user_id,
+    )
+    await db_session.commit()
+    sub = await create_submission(
+        db_session, proj.id, learner.id, SubmissionCreate(message="Learner first")
+    )
+    await db_session.commit()
+    for body in ("Owner reply 1", "Owner reply 2"):
+        await add_message(db_session, sub.id, seed_user_id, MessageCreate(body=body))
+        await db_session.commit()
+
+    as_learner = await get_submission_by_project_and_learner(db_session, proj.id, learner.id)
+    [as_owner] = await list_submissions_by_project(db_session, proj.id, seed_user_id)
+    [mine] = await list_submissions_by_learner(db_session, learner.id)
+    await db_session.commit()
+    assert as_learner.message_count == as_owner.message_count == mine.message_count == 3
+    assert as_learner.unread_count == mine.unread_count == 2
+    assert as_owner.unread_count == 1
+
+    assert await mark_submission_read(db_session, sub.id, learner.id) is True
+    await db_session.commit()
+    [mine] = await list_submissions_by_learner(db_session, learner.id)
+    await db_session.commit()
+    assert mine.unread_count == 0
+
+
+@pytest.mark.asyncio
+async def test_thread_counters_match_message_table(db_session: AsyncSession, seed_user_id: str):
+    """Counters maintained on write agree with a recompute from the messages table."""
+    learner = await create_user(
+        db_session,
+        UserCreate(email=f"learner-{uuid.uuid4().hex}@example.com", password="testpass1234"),
+    )
+    proj = await crud_create_project(
+        db_session,
+        ProjectCreate(
+            title="P",
+            domain="D",
+            short_description="S",
+            full_description="F",
+            deadline="2026-12-31",
+        ),
+        seed_user_id,
+    )
+    await db_session.commit()
+    sub = await create_submission(
+        db_session, proj.id, learner.id, SubmissionCreate(message="First")
+    )
+    await db_session.commit()
+    for sender in (seed_user_id, learner.id, seed_user_id):
+        await add_message(db_session, sub.id, sender, MessageCreate(body="Reply"))
+        await db_session.commit()
+    await mark_submission_read(db_session, sub.id, seed_user_id)
+    # Read time from the database clock, like message created_at
+    read_at = await db_session.scalar(
+        select(Submission.owner_last_read_at).where(Submission.id == sub.id)
+    )
+    assert read_at == await db_session.scalar(select(func.now()))
+    await db_session.commit()
+    await add_message(db_session, sub.id, learner.id, MessageCreate(body="After read"))
+    await db_session.commit()
+
+    assert await recompute_thread_counters(db_session, sub.id) == []
+    await db_session.commit()
+    [as_owner] = await list_submissions_by_project(db_session, proj.id, seed_user_id)
+    [as_learner] = await list_submissions_by_learner(db_session, learner.id)
+    await db_session.commit()
+    assert as_owner.message_count == 5
+    assert as_owner.unread_count == 1
+    assert as_learner.unread_count == 2
+    assert as_owner.last_message_sender_id == learner.id
+
+
+@pytest.mark.asyncio
+async def test_recompute_thread_counters_repairs_drift(
+    db_session: AsyncSession, seed_user_id: str
+):
+    proj = await crud_create_project(
+        db_session,
+        ProjectCreate(
+            title="P",
+            domain="D",
+            short_description="S",
+            full_description="F",
+            deadline="2026-12-31",
+        ),
+        seed_user_id,
+    )
+    await db_session.commit()
+    sub = await create_submission(
+        db_session, proj.id, seed_user_id, SubmissionCreate(message="Hi")
+    )
+    await db_session.commit()
+    await db_session.execute(
+        update(Submission)
+        .where(Submission.id == sub.id)
+        .values(message_count=42, learner_unread_count=7)
+    )
+    await db_session.commit()
+    assert await recompute_thread_counters(db_session, sub.id) == [sub.id]
+    await db_session.commit()
+    [out] = await list_submissions_by_project(db_session, proj.id, seed_user_id)
+    await db_session.commit()
+    assert out.message_count == 1
+    assert await recompute_thread_counters(db_session, sub.id) == []
+    await db_session.commit()
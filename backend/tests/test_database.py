@@ -0,0 +1,27 @@
+"""Tests for session dependencies in app.database."""
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal, ReadSessionLocal
+from app.models.user import User
+
+
+async def test_read_session_runs_without_transaction(ensure_tables):
+    """now() is the transaction start time: equal inside one transaction, not in autocommit."""
+    async with AsyncSessionLocal() as db:
+        first = await db.scalar(select(func.now()))
+        second = await db.scalar(select(func.now()))
+        assert first == second
+    async with ReadSessionLocal() as db:
+        first = await db.scalar(select(func.now()))
+        await db.scalar(select(func.pg_sleep(0.01)))
+        second = await db.scalar(select(func.now()))
+        assert second > first
+
+
+async def test_read_session_rejects_writes(ensure_tables):
+    async with ReadSessionLocal() as db:
+        db.add(User(email="never-written@example.com", password_hash="x"))
+        with pytest.raises(RuntimeError, match="Read-only session"):
+            await db.flush()
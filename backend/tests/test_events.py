@@ -0,0 +1,198 @@
+"""Real-time thread events: NOTIFY on write, fan-out through EventBroker."""
+
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import create_access_token
+from app.crud.projects import create_project
+from app.crud.submissions import add_message, create_submission, mark_submission_read
+from app.crud.users import create_user
+from app.events import EventBroker, broker, format_sse
+from app.main import app
+from app.models.user import User
+from app.schemas.project import ProjectCreate
+from app.schemas.submission import MessageCreate, SubmissionCreate
+from app.schemas.user import UserCreate
+
+
+async def _thread(db: AsyncSession, owner_id: str):
+    learner = await create_user(
+        db,
+        UserCreate(email=f"learner-{uuid.uuid4().hex}@example.com", password="testpass1234"),
+    )
+    proj = await create_project(
+        db,
+        ProjectCreate(
+            title="P",
+            domain="D",
+            short_description="S",
+            full_description="F",
+            deadline="2026-12-31",
+        ),
+        owner_id,
+    )
+    sub = await create_submission(db, proj.id, learner.id, SubmissionCreate(message="Hi"))
+    await db.commit()
+    return learner.id, sub.id
+
+
+async def _next(queue: asyncio.Queue):
+    return await asyncio.wait_for(queue.get(), timeout=5)
+
+
+async def _bearer(db: AsyncSession, user_id: str) -> dict[str, str]:
+    user = await db.get(User, user_id)
+    return {"Authorization": f"Bearer {create_access_token(user.id, user.email)}"}
+
+
+@pytest.mark.asyncio
+async def test_message_is_pushed_to_both_sides(db_session: AsyncSession, seed_user_id: str):
+    learner_id, submission_id = await _thread(db_session, seed_user_id)
+    broker = EventBroker()
+    try:
+        owner_q = await broker.subscribe(seed_user_id)
+        learner_q = await broker.subscribe(learner_id)
+        msg = await add_message(db_session, submission_id, seed_user_id, MessageCreate(body="Hello"))
+        # Nothing is delivered before commit
+        await asyncio.sleep(0.2)
+        assert learner_q.empty()
+        await db_session.commit()
+
+        event, data = await _next(learner_q)
+        assert event == "message"
+        assert data["id"] == msg.id
+        assert data["body"] == "Hello"
+        assert await _next(learner_q) == (
+            "unread",
+            {"submission_id": submission_id, "unread_count": 1},
+        )
+        assert (await _next(owner_q))[0] == "message"
+        assert (await _next(owner_q))[1]["unread_count"] == 1  # the learner's first message
+
+        await mark_submission_read(db_session, submission_id, learner_id)
+        await db_session.commit()
+        assert await _next(learner_q) == (
+            "unread",
+            {"submission_id": submission_id, "unread_count": 0},
+        )
+    finally:
+        await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_message_is_not_pushed(db_session: AsyncSession, seed_user_id: str):
+    learner_id, submission_id = await _thread(db_session, seed_user_id)
+    broker = EventBroker()
+    try:
+        queue = await broker.subscribe(learner_id)
+        await add_message(db_session, submission_id, seed_user_id, MessageCreate(body="Oops"))
+        await db_session.rollback()
+        await asyncio.sleep(0.3)
+        assert queue.empty()
+    finally:
+        await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_large_message_is_reloaded_by_id(db_session: AsyncSession, seed_user_id: str):
+    """Bodies too big for a NOTIFY payload are sent by id and read back by the listener."""
+    learner_id, submission_id = await _thread(db_session, seed_user_id)
+    broker = EventBroker()
+    try:
+        queue = await broker.subscribe(learner_id)
+        body = "x" * 9000
+        await add_message(db_session, submission_id, seed_user_id, MessageCreate(body=body))
+        await db_session.commit()
+        event, data = await _next(queue)
+        assert event == "message"
+        assert data["body"] == body
+    finally:
+        await broker.stop()
+
+
+def test_unsubscribe_and_format():
+    broker = EventBroker()
+    queue: asyncio.Queue = asyncio.Queue()
+    broker._subscribers["u"] = {queue}
+    assert broker.subscriber_count == 1
+    broker.unsubscribe("u", queue)
+    assert broker.subscriber_count == 0
+    out = format_sse("unread", {"submission_id": "s", "unread_count": 2})
+    assert out.startswith("event: unread\ndata: ")
+    assert json.loads(out.split("data: ", 1)[1]) == {"submission_id": "s", "unread_count": 2}
+
+
+def test_stream_requires_auth(client: TestClient):
+    assert client.get("/submissions/stream").status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_stream_delivers_message_and_unread(db_session: AsyncSession, seed_user_id: str):
+    """GET /submissions/stream end to end: the owner posts, the learner's stream gets both
+    events. Driven as raw ASGI, since TestClient only returns a response once it ends.
+    """
+    learner_id, submission_id = await _thread(db_session, seed_user_id)
+    learner_headers = await _bearer(db_session, learner_id)
+    owner_headers = await _bearer(db_session, seed_user_id)
+    chunks: asyncio.Queue = asyncio.Queue()
+    closed = asyncio.Event()
+
+    async def receive():
+        await closed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            chunks.put_nowait(message["status"])
+        elif message.get("body"):
+            chunks.put_nowait(message["body"].decode())
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/submissions/stream",
+        "raw_path": b"/submissions/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in learner_headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+    }
+    stream = asyncio.create_task(app(scope, receive, send))
+    try:
+        assert await _next(chunks) == 200
+        # Subscribed (and listening) once the first line is out
+        assert await _next(chunks) == "retry: 5000\n\n"
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            r = await http.post(
+                f"/submissions/{submission_id}/messages",
+                json={"body": "Hello"},
+                headers=owner_headers,
+            )
+        assert r.status_code == 201
+
+        events = []
+        while len(events) < 2:
+            chunk = await _next(chunks)
+            if chunk.startswith("event: "):
+                head, data = chunk.split("\ndata: ", 1)
+                events.append((head.removeprefix("event: "), json.loads(data)))
+        assert events[0][0] == "message"
+        assert events[0][1]["id"] == r.json()["id"]
+        assert events[0][1]["body"] == "Hello"
+        assert events[1] == ("unread", {"submission_id": submission_id, "unread_count": 1})
+    finally:
+        closed.set()
+        await asyncio.wait_for(stream, timeout=5)
+        await broker.stop()
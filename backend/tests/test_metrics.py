@@ -0,0 +1,91 @@
+"""Prometheus /metrics: per-route samples, exposition format and multi-worker merging."""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.prometheus import merge, read_snapshots, render, write_snapshot
+
+
+def _histogram(counts: dict[str, int], total: float) -> dict:
+    return {"buckets": counts, "sum": total, "count": counts["+Inf"]}
+
+
+def test_metrics_endpoint(client: TestClient):
+    client.get("/projects/1")
+    client.get("/no-such-route")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+    assert "# TYPE toolme_http_requests_total counter" in text
+    assert 'toolme_http_requests_total{method="GET",route="/projects/{project_id}",status="200"}' in text
+    assert 'route="<unmatched>",status="404"' in text
+    assert 'toolme_http_request_duration_seconds_bucket{method="GET",route="/projects/{project_id}",le="+Inf"}' in text
+    # The scrape itself is in flight
+    assert 'toolme_http_requests_in_flight{method="GET"} 1.0' in text
+    for name in (
+        "toolme_db_query_duration_seconds_count",
+        'toolme_db_pool_connections{state="idle"}',
+        "toolme_password_hash_queued",
+        "# TYPE toolme_rate_limit_rejections_total counter",
+    ):
+        assert name in text
+
+
+def test_merge_sums_counters_and_live_gauges():
+    def worker(requests: float, in_flight: float, bucket: int) -> list[dict]:
+        return [
+            {
+                "name": "requests_total",
+                "type": "counter",
+                "help": "Requests.",
+                "samples": [[{"route": "/a"}, requests]],
+            },
+            {
+                "name": "in_flight",
+                "type": "gauge",
+                "help": "In flight.",
+                "samples": [[{}, in_flight]],
+            },
+            {
+                "name": "latency_seconds",
+                "type": "histogram",
+                "help": "Latency.",
+                "samples": [[{}, _histogram({"0.1": bucket, "+Inf": bucket + 1}, 1.0)]],
+            },
+        ]
+
+    merged = {m["name"]: m for m in merge([(True, worker(2, 1, 3)), (False, worker(5, 4, 1))])}
+    assert merged["requests_total"]["samples"] == [[{"route": "/a"}, 7]]
+    # An exited worker's gauges are dropped, its counters kept
+    assert merged["in_flight"]["samples"] == [[{}, 1]]
+    assert merged["latency_seconds"]["samples"] == [
+        [{}, _histogram({"0.1": 4, "+Inf": 6}, 2.0)]
+    ]
+    text = render(list(merged.values()))
+    assert 'requests_total{route="/a"} 7.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 4.0' in text
+    assert "latency_seconds_count 6.0" in text
+
+
+def test_snapshots_shared_through_directory(tmp_path):
+    write_snapshot(str(tmp_path))
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    # Another (exited) worker's file
+    other = [
+        {
+            "name": "toolme_rate_limit_rejections_total",
+            "type": "counter",
+            "help": "Requests refused with 429 by the rate limiter.",
+            "samples": [[{"route": "/auth/login"}, 3]],
+        }
+    ]
+    (tmp_path / "999999999.json").write_text(json.dumps(other))
+    snapshots = read_snapshots(str(tmp_path))
+    # This worker's own file is replaced by its live samples
+    assert len(snapshots) == 2
+    assert snapshots[1] == (False, other)
+    text = render(merge(snapshots))
+    assert 'toolme_rate_limit_rejections_total{route="/auth/login"} 3.0' in text
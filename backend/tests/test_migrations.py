@@ -0,0 +1,119 @@
+"""Versioned migrations on a scratch database: concurrent runners, data backfills."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.cache_invalidation import CHANNEL
+from app.crud.submissions import recompute_thread_counters
+from app.database import DATABASE_URL, engine
+from app.migrations import LATEST_VERSION, MIGRATIONS, current_version, migrate
+
+SCRATCH_DB = "toolme_test_migrations"
+
+
+@asynccontextmanager
+async def _scratch_engine():
+    """Engine on an empty database, dropped afterwards."""
+    admin = create_async_engine(DATABASE_URL, poolclass=NullPool, isolation_level="AUTOCOMMIT")
+    async with admin.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{SCRATCH_DB}"'))
+        await conn.execute(text(f'CREATE DATABASE "{SCRATCH_DB}"'))
+    url = make_url(DATABASE_URL).set(database=SCRATCH_DB)
+    scratch = create_async_engine(url, poolclass=NullPool)
+    try:
+        yield scratch
+    finally:
+        await scratch.dispose()
+        async with admin.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{SCRATCH_DB}"'))
+        await admin.dispose()
+
+
+async def test_concurrent_migrate_applies_each_version_once(ensure_tables):
+    async with _scratch_engine() as scratch:
+        async with scratch.connect() as conn:
+            assert await current_version(conn) == 0
+
+        # Workers starting together: one migrates, the others wait on the lock and find
+        # nothing to do
+        results = await asyncio.gather(*(migrate(scratch) for _ in range(3)))
+        assert sorted(len(applied) for applied in results) == [0, 0, len(MIGRATIONS)]
+
+        async with scratch.connect() as conn:
+            assert await current_version(conn) == LATEST_VERSION
+            versions = (await conn.scalars(text("SELECT version FROM schema_migrations"))).all()
+            assert sorted(versions) == [m.version for m in MIGRATIONS]
+            assert await conn.scalar(text("SELECT to_regclass('messages')")) is not None
+        assert await migrate(scratch) == []
+
+
+async def test_thread_counters_backfill_matches_recompute(ensure_tables):
+    async with _scratch_engine() as scratch:
+        # A database from before the counters (and the runner, so migrate() replays the
+        # idempotent earlier steps), with a conversation in it
+        async with scratch.begin() as conn:
+            for migration in MIGRATIONS:
+                if migration.name == "submission thread counters":
+                    break
+                await migration.upgrade(conn)
+            await conn.execute(
+                text(
+                    "INSERT INTO users (id, email, password_hash) VALUES "
+                    "('owner', 'owner@example.com', 'x'), "
+                    "('learner', 'learner@example.com', 'x')"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO projects (id, title, domain, short_description, "
+                    "full_description, deadline, user_id) "
+                    "VALUES ('p', 'T', 'D', 'S', 'F', '2026-12-31', 'owner')"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO submissions (id, project_id, learner_id, owner_last_read_at) "
+                    "VALUES ('s', 'p', 'learner', '2026-01-02'), "
+                    "('quiet', 'p', 'owner', NULL)"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO messages (id, submission_id, sender_id, body, created_at) "
+                    "VALUES ('m1', 's', 'learner', 'a', '2026-01-01'), "
+                    "('m2', 's', 'owner', 'b', '2026-01-03'), "
+                    "('m3', 's', 'learner', 'c', '2026-01-04'), "
+                    "('m4', 's', 'learner', 'd', '2026-01-05')"
+                )
+            )
+        await migrate(scratch)
+
+        async with AsyncSession(scratch) as session:
+            assert await recompute_thread_counters(session) == []
+            rows = (
+                await session.execute(
+                    text(
+                        "SELECT id, message_count, last_message_sender_id, "
+                        "learner_unread_count, owner_unread_count FROM submissions ORDER BY id"
+                    )
+                )
+            ).all()
+        assert [tuple(r) for r in rows] == [
+            ("quiet", 0, None, 0, 0),
+            ("s", 4, "learner", 1, 2),
+        ]
+
+
+async def test_current_schema_needs_no_migration(ensure_tables):
+    async with engine.connect() as conn:
+        assert await current_version(conn) == LATEST_VERSION
+        # The invalidation listener hears what the projects triggers send
+        trigger = await conn.scalar(
+            text("SELECT prosrc FROM pg_proc WHERE proname = 'toolme_notify_project_change'")
+        )
+    assert f"pg_notify('{CHANNEL}'" in trigger
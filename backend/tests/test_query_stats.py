@@ -0,0 +1,89 @@
+"""Query counting: response headers and per-endpoint query budgets (N+1 guard)."""
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.crud.projects import clear_project_caches
+
+
+def test_query_count_headers(client: TestClient):
+    r = client.get("/projects")
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) >= 1
+    assert r.headers["Server-Timing"].startswith("db;dur=")
+    assert client.get("/health").headers["X-DB-Queries"] == "0"
+
+
+def test_public_read_budgets(client: TestClient, query_budget):
+    clear_project_caches()
+    with query_budget(2):
+        assert client.get("/projects?limit=50").status_code == 200
+    with query_budget(1):
+        r = client.get("/projects/1")
+        assert r.status_code == 200
+    # Now served by the project caches, revalidation included
+    with query_budget(0):
+        assert client.get("/projects?limit=50").status_code == 200
+        assert client.get("/projects/1", headers={"If-None-Match": r.headers["ETag"]}).status_code == 304
+    # Revalidating an uncached project reads only updated_at
+    clear_project_caches()
+    with query_budget(1) as stats:
+        assert client.get("/projects/1", headers={"If-None-Match": r.headers["ETag"]}).status_code == 304
+    assert "full_description" not in stats.statements[0]
+    with query_budget(2):
+        assert client.get("/projects/search?q=wiki").status_code == 200
+
+
+def test_submission_route_budgets(
+    client: TestClient, auth_headers, query_budget, thread_with_messages
+):
+    submission_id = thread_with_messages(auth_headers, 5)
+    # Load the current user into the user cache so budgets do not depend on test order
+    client.get("/auth/me", headers=auth_headers)
+
+    with query_budget(1):
+        assert client.get("/submissions/me", headers=auth_headers).status_code == 200
+    # Access check is one joined query (submission + project owner), reused by the CRUD call
+    with query_budget(2):
+        assert client.get(f"/submissions/{submission_id}", headers=auth_headers).status_code == 200
+    with query_budget(2):
+        r = client.get(f"/submissions/{submission_id}/messages", headers=auth_headers)
+        assert r.status_code == 200
+    # Access check, INSERT message + counter UPDATE in one statement, NOTIFY
+    with query_budget(3):
+        r = client.post(
+            f"/submissions/{submission_id}/messages",
+            json={"body": "Within budget"},
+            headers=auth_headers,
+        )
+        assert r.status_code == 201
+    with query_budget(3):
+        r = client.post(f"/submissions/{submission_id}/read", headers=auth_headers)
+        assert r.status_code == 204
+
+
+def test_create_budgets(client: TestClient, auth_headers, query_budget):
+    client.get("/auth/me", headers=auth_headers)
+    email = f"budget-{uuid.uuid4().hex}@example.com"
+    signup = {"email": email, "password": "testpass1234", "password_confirm": "testpass1234"}
+    with query_budget(1):
+        assert client.post("/auth/signup", json=signup).status_code == 201
+    with query_budget(1):
+        assert client.post("/auth/signup", json=signup).status_code == 400
+
+    project = {
+        "title": "Budget",
+        "domain": "Test",
+        "short_description": "S",
+        "full_description": "F",
+        "deadline": "2030-01-01",
+    }
+    with query_budget(1):
+        r = client.post("/projects", json=project, headers=auth_headers)
+        assert r.status_code == 201
+    url = f"/projects/{r.json()['id']}/submissions"
+    with query_budget(2):
+        assert client.post(url, json={"message": "Hi"}, headers=auth_headers).status_code == 201
+    with query_budget(2):
+        assert client.post(url, json={"message": "Again"}, headers=auth_headers).status_code == 409
@@ -0,0 +1,175 @@
+"""Read-replica routing: a second local database stands in for the replica."""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.database as database
+from app.crud.users import user_cache
+from app.database import DATABASE_URL, ReplicaRouter
+from app.migrations import migrate
+from app.models.project import Project
+from app.models.user import User
+
+REPLICA_DB = "toolme_test_replica"
+
+
+async def _prepare_replica(url: str) -> str:
+    """Create the stand-in replica with one project that does not exist on the primary."""
+    admin = create_async_engine(
+        DATABASE_URL, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    async with admin.connect() as conn:
+        exists = await conn.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": REPLICA_DB}
+        )
+        if not exists:
+            await conn.execute(text(f'CREATE DATABASE "{REPLICA_DB}"'))
+    await admin.dispose()
+
+    replica = create_async_engine(url, poolclass=NullPool)
+    await migrate(replica)
+    async with replica.begin() as conn:
+        user_id = str(uuid.uuid4())
+        project_id = str(uuid.uuid4())
+        await conn.execute(
+            User.__table__.insert().values(
+                id=user_id, email=f"replica-{user_id}@example.com", password_hash="x"
+            )
+        )
+        await conn.execute(
+            Project.__table__.insert().values(
+                id=project_id,
+                title="Only on the replica",
+                domain="Replica",
+                short_description="Stand-in replica row",
+                full_description="Served only when reads are routed to the replica.",
+                deadline="2030-01-01",
+                delivery_instructions="None",
+                user_id=user_id,
+            )
+        )
+    await replica.dispose()
+    return project_id
+
+
+@pytest.fixture
+def replica_project_id(client: TestClient, monkeypatch):
+    """Route get_read_db to the stand-in replica; yields the id of its replica-only project."""
+    url = make_url(DATABASE_URL).set(database=REPLICA_DB).render_as_string(hide_password=False)
+    project_id = asyncio.run(_prepare_replica(url))
+    router = ReplicaRouter([url], sticky_seconds=30)
+    monkeypatch.setattr(database, "replicas", router)
+    yield project_id
+    client.portal.call(router.dispose)
+
+
+def test_reads_go_to_replica(client: TestClient, replica_project_id: str):
+    r = client.get(f"/projects/{replica_project_id}")
+    assert r.status_code == 200
+    assert r.json()["title"] == "Only on the replica"
+
+
+def test_write_goes_to_primary_and_sticks(
+    client: TestClient, auth_headers: dict, replica_project_id: str
+):
+    payload = {
+        "title": "Written to primary",
+        "domain": "Test",
+        "short_description": "Short",
+        "full_description": "Full description",
+        "deadline": "2030-01-01",
+        "delivery_instructions": "Send a link",
+    }
+    r = client.post("/projects", json=payload, headers=auth_headers)
+    assert r.status_code == 201
+    assert ReplicaRouter.STICKY_COOKIE in r.cookies
+    created_id = r.json()["id"]
+
+    # Within the sticky window this client reads from the primary: sees its write,
+    # not the replica-only row
+    assert client.get(f"/projects/{created_id}").status_code == 200
+    assert client.get(f"/projects/{replica_project_id}").status_code == 404
+
+    client.cookies.delete(ReplicaRouter.STICKY_COOKIE)
+    assert client.get(f"/projects/{replica_project_id}").status_code == 200
+    # The sticky read above cached the primary's row, fresher than the replica
+    assert client.get(f"/projects/{created_id}").status_code == 200
+
+
+async def _copy_to_replica(url: str, project: dict) -> None:
+    """Replicate a primary project (and its owner) as it is now: later writes lag."""
+    replica = create_async_engine(url, poolclass=NullPool)
+    async with replica.begin() as conn:
+        await conn.execute(
+            User.__table__.insert().values(
+                id=project["user_id"],
+                email=f"lag-{project['user_id']}@example.com",
+                password_hash="x",
+            )
+        )
+        await conn.execute(
+            Project.__table__.insert().values(
+                {k: v for k, v in project.items() if k not in ("created_at", "updated_at")}
+            )
+        )
+    await replica.dispose()
+
+
+def test_lagging_replica_does_not_fill_project_cache(
+    client: TestClient, auth_headers: dict, replica_project_id: str
+):
+    payload = {
+        "title": "Before",
+        "domain": "Test",
+        "short_description": "Short",
+        "full_description": "Full description",
+        "deadline": "2030-01-01",
+    }
+    project = client.post("/projects", json=payload, headers=auth_headers).json()
+    url = make_url(DATABASE_URL).set(database=REPLICA_DB).render_as_string(hide_password=False)
+    asyncio.run(_copy_to_replica(url, project))
+    r = client.put(
+        f"/projects/{project['id']}", json={"title": "After"}, headers=auth_headers
+    )
+    assert r.status_code == 200
+    sticky = client.cookies.get(ReplicaRouter.STICKY_COOKIE)
+
+    # Another client (no sticky cookie) reads the stale row from the replica...
+    client.cookies.delete(ReplicaRouter.STICKY_COOKIE)
+    assert client.get(f"/projects/{project['id']}").json()["title"] == "Before"
+    assert client.get("/projects?limit=100").status_code == 200
+    # ...without caching it: the writer still reads its write
+    client.cookies.set(ReplicaRouter.STICKY_COOKIE, sticky)
+    assert client.get(f"/projects/{project['id']}").json()["title"] == "After"
+    titles = [p["title"] for p in client.get("/projects?limit=100").json()["items"]]
+    assert "Before" not in titles
+
+
+def test_new_bearer_user_authenticates_despite_lagging_replica(
+    client: TestClient, replica_project_id: str
+):
+    email = f"fresh-{uuid.uuid4().hex}@example.com"
+    password = "securepass123"
+    r = client.post(
+        "/auth/signup",
+        json={"email": email, "password": password, "password_confirm": password},
+    )
+    assert r.status_code == 201
+    user_id = r.json()["id"]
+    token = client.post("/auth/login", json={"email": email, "password": password}).json()[
+        "access_token"
+    ]
+    # A bearer-only client: no sticky cookie, so its GETs go to the replica, which has
+    # not seen the signup
+    client.cookies.clear()
+    user_cache.pop(user_id)
+    r = client.get("/projects/me", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200
+    assert user_cache.get(user_id).email == email
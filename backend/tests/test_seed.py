@@ -0,0 +1,39 @@
+"""Tests for app.seed (default and synthetic seed data)."""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+from app.models.project import Project
+from app.models.submission import Submission
+from app.seed import SEED_PROJECTS, seed_defaults, seed_synthetic
+
+
+async def test_seed_defaults_is_idempotent(db_session: AsyncSession):
+    assert await seed_defaults(db_session) == 0
+    ids = [p["id"] for p in SEED_PROJECTS]
+    count = await db_session.scalar(select(func.count()).where(Project.id.in_(ids)))
+    assert count == len(SEED_PROJECTS)
+
+
+async def test_seed_synthetic_counts_and_thread_counters(db_session: AsyncSession):
+    counts = await seed_synthetic(
+        db_session, users=3, projects=4, submissions=20, messages=30, batch_size=7
+    )
+    # At most one submission per (project, learner)
+    assert counts == {"users": 3, "projects": 4, "submissions": 12, "messages": 30}
+
+    synthetic = Project.title.like("Synthetic project %")
+    rows = (
+        await db_session.execute(
+            select(Submission.id, Submission.message_count)
+            .join(Project, Project.id == Submission.project_id)
+            .where(synthetic)
+        )
+    ).all()
+    assert len(rows) >= 12
+    ids = [r.id for r in rows]
+    messages = await db_session.scalar(
+        select(func.count()).where(Message.submission_id.in_(ids))
+    )
+    assert sum(r.message_count for r in rows) == messages
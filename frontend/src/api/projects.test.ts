@@ -37,6 +37,7 @@ describe('projects api', () => {
         }),
     })
     const { projects, total } = await fetchProjects()
+    expect(String(mockFetch.mock.calls[0][0])).toContain('view=summary')
     expect(projects).toHaveLength(1)
     expect(projects[0]).toMatchObject({ id: '1', title: 'P', ownerId: 'u1' })
     expect(total).toBe(1)
@@ -46,7 +46,7 @@ export type FetchProjectsResult = {
   total: number
 }
 
-/** Fetch projects with pagination (for home page). Default limit 12. */
+/** Fetch projects with pagination (for home page). Default limit 12. Card fields only (view=summary). */
 export async function fetchProjects(
   params: FetchProjectsParams = {}
 ): Promise<FetchProjectsResult> {
@@ -54,6 +54,7 @@ export async function fetchProjects(
   const url = new URL(base())
   url.searchParams.set('skip', String(skip))
   url.searchParams.set('limit', String(limit))
+  url.searchParams.set('view', 'summary')
   const res = await fetch(String(url), fetchOpts)
   if (!res.ok) {
     throw new Error(`Failed to fetch projects: ${res.status}`)
@@ -65,9 +66,9 @@ export async function fetchProjects(
   }
 }
 
-/** Projects owned by the current user (requires auth). */
+/** Projects owned by the current user (requires auth). Card fields only (view=summary). */
 export async function fetchMyProjects(): Promise<Project[]> {
-  const res = await fetch(`${base()}/me`, fetchOpts)
+  const res = await fetch(`${base()}/me?view=summary`, fetchOpts)
   if (!res.ok) {
     throw new Error(`Failed to fetch my projects: ${res.status}`)
   }
@@ -10,13 +10,14 @@ export type Project = {
   ownerId: string
 }
 
-/** API response shape (snake_case from backend) */
+/** API response shape (snake_case from backend). List views with view=summary omit
+ * full_description and delivery_instructions. */
 export type ProjectApiResponse = {
   id: string
   title: string
   domain: string
   short_description: string
-  full_description: string
+  full_description?: string
   deadline: string
   delivery_instructions?: string | null
   created_at: string
@@ -49,7 +50,7 @@ export function mapProjectFromApi(raw: ProjectApiResponse): Project {
     title: raw.title,
     domain: raw.domain,
     shortDescription: raw.short_description,
-    fullDescription: raw.full_description,
+    fullDescription: raw.full_description ?? '',
     deadline: raw.deadline,
     deliveryInstructions: raw.delivery_instructions ?? undefined,
     createdAt: raw.created_at,